@@ -0,0 +1,142 @@
+"""전처리 / 최종 머지 / 내보내기 소요 시간 측정
+
+사용 예 (저장소 루트에서):
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 1000 100000 1000000 --processors v1 v5 -o bench.json
+
+원장 크기마다 가짜 기준 데이터와 원장을 만들고
+전처리기별 단계(normalize → extract → match → suggest → classify → flag, finalize) 시간,
+최종 머지, 형식별 내보내기 시간을 JSON 으로 남긴다.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from benchmarks.synthetic import make_base, make_ledger
+from utils.dtypes import apply_dtypes
+from utils.export import EXPORT_FORMATS, write_output
+from utils.matching import VehicleIndex
+from utils.pipeline import final_merge, prepare_base
+from versions.registry import SPECS, get_processor
+
+
+DEFAULT_SIZES = [1_000, 10_000, 100_000]
+
+
+def timed(fn, *args):
+    started = time.perf_counter()
+    result = fn(*args)
+    return result, round(time.perf_counter() - started, 4)
+
+
+def bench_processor(processor, ledger, index):
+    stages = {}
+    df = ledger
+    for stage in processor.STAGES:
+        df, stages[stage] = timed(getattr(processor, stage), df, index)
+    df, stages["finalize"] = timed(processor.finalize, df)
+
+    record = {
+        "stages": stages,
+        "total": round(sum(stages.values()), 4),
+        "rows_in": len(ledger),
+        "rows_out": len(df),
+    }
+    if "상품ID" in df.columns and len(df):
+        record["match_rate"] = round(float(df["상품ID"].notna().mean()), 4)
+    return df, record
+
+
+def bench_size(rows, base_rows, keys, formats, seed=0):
+    base_df, t_base = timed(lambda: prepare_base(make_base(base_rows, seed)))
+    # 엑셀을 읽은 것처럼 dtype 정책까지 적용
+    ledger, t_ledger = timed(lambda: apply_dtypes(make_ledger(base_df, rows, seed)))
+    index, t_index = timed(VehicleIndex, base_df)
+
+    record = {
+        "rows": rows,
+        "base_rows": base_rows,
+        "ledger_rows": len(ledger),
+        "memory_mb": {
+            "base": round(base_df.memory_usage(deep=True).sum() / 2 ** 20, 1),
+            "ledger": round(ledger.memory_usage(deep=True).sum() / 2 ** 20, 1),
+        },
+        "generate": {"base": t_base, "ledger": t_ledger},
+        "index_build": t_index,
+        "processors": {},
+    }
+
+    results = {}
+    for key in keys:
+        processor = get_processor(key)
+        df, record["processors"][key] = bench_processor(processor, ledger, index)
+        results[processor.name] = {"df": df, "merge_key": processor.merge_key}
+        print(f"  {key:<4} {record['processors'][key]['total']:>8.3f}s", file=sys.stderr)
+
+    (_, report), record["final_merge"] = timed(final_merge, base_df, results)
+    record["fanout"] = report
+
+    # 내보내기: 첫 번째 결과(원장 크기) 기준
+    record["export"] = {}
+    if formats and results:
+        df = next(iter(results.values()))["df"]
+        with tempfile.TemporaryDirectory() as tmp:
+            for fmt in formats:
+                path = Path(tmp) / f"out.{EXPORT_FORMATS[fmt][0]}"
+                _, record["export"][fmt] = timed(write_output, df, path, fmt, "관리항목2")
+
+    return record
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="손익분석 전처리 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="원장 행 수 (여러 개)")
+    parser.add_argument("--base-rows", type=int, default=None, help="기준 데이터 행 수 (기본: 원장의 절반, 최소 1000)")
+    parser.add_argument("--processors", nargs="+", default=list(SPECS), choices=list(SPECS), help="측정할 전처리기")
+    parser.add_argument("--formats", nargs="*", default=list(EXPORT_FORMATS), choices=list(EXPORT_FORMATS), help="측정할 내보내기 형식")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", default="benchmarks/results.json", help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    runs = []
+    for rows in args.sizes:
+        base_rows = args.base_rows or max(1_000, rows // 2)
+        print(f"원장 {rows:,}행 / 기준 {base_rows:,}행", file=sys.stderr)
+        runs.append(bench_size(rows, base_rows, args.processors, args.formats, args.seed))
+
+    output = {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "runs": runs,
+    }
+
+    path = Path(args.output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(output, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"저장: {path}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
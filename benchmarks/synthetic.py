@@ -0,0 +1,138 @@
+"""벤치마크용 가짜 기준 데이터 / ERP 원장
+
+실제 엑셀을 읽은 것과 같은 모양으로 만든다.
+- 기준 데이터: 상품ID, 판매일자, 신차량번호, 구차량번호, 판매처
+- 원장: 적요에 차량번호('12가3456', '서울12가3456', '12가3456(34나5678)', 띄어쓰기, 지게차),
+  +/- 취소 전표, 월마다 월계/누계 행, 법인 표기가 다른 거래처 이름
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+from utils.plate import REGIONS
+from utils.rules import RULES_DIR
+from utils.vendor import VENDOR_MAPPING_PATH
+
+
+HANGUL = list("가나다라마거너더러머버서어저고노도로모보소오조구누두루무부수우주하허호")
+SELLERS = ["A상사", "B모터스", "C오토", "D캐피탈", "E렌탈"]
+ACCOUNTS = ["기타매출(리본케어)", "기타매출(리본케어플러스)", "기타매출(엔카홈서비스)", "기타매출(탁송비)", "상품매출"]
+
+
+def random_plates(rng, n, region_rate=0.3):
+    region = np.where(rng.random(n) < region_rate, rng.choice(REGIONS, n), "")
+    return (
+        pd.Series(region)
+        + rng.integers(10, 400, n).astype(str)
+        + rng.choice(HANGUL, n)
+        + rng.integers(1000, 10000, n).astype(str)
+    ).to_numpy(dtype=object)
+
+
+def rule_keywords():
+    # config/rules 의 키워드 전부 (분류 규칙이 실제로 걸리도록)
+    keywords = []
+    for path in sorted(RULES_DIR.glob("*.json")):
+        with open(path, encoding="utf-8") as f:
+            for section in json.load(f)["sections"]:
+                for rule in section["rules"]:
+                    keywords += rule.get("keywords", [])
+    return keywords
+
+
+def vendor_names():
+    # 매핑에 있는 이름 + 법인 표기만 다른 이름 + 모르는 이름
+    with open(VENDOR_MAPPING_PATH, encoding="utf-8") as f:
+        vendors = json.load(f)["vendors"]
+    names = [alias for aliases in vendors.values() for alias in aliases]
+    names += [f"{v}(주)" for v in vendors] + [f"주식회사 {v}" for v in vendors]
+    names += ["새거래처(주)", "개인"]
+    return names
+
+
+def make_base(n, seed=0, start="2024-01-01", days=365):
+    rng = np.random.default_rng(seed)
+
+    old = random_plates(rng, n)
+    old[rng.random(n) < 0.3] = None
+
+    return pd.DataFrame({
+        "상품ID": pd.Series(np.arange(n)).map("C{:08d}".format),
+        "판매일자": pd.Timestamp(start) + pd.to_timedelta(rng.integers(0, days, n), unit="D"),
+        "신차량번호": random_plates(rng, n),
+        "구차량번호": old,
+        "판매처": rng.choice(SELLERS, n),
+    })
+
+
+def make_ledger(base, n, seed=0, match_rate=0.7, reversal_rate=0.1):
+    """기준 데이터 차량을 참조하는 원장 n 행 (+ 취소 전표, 월계/누계 행)
+
+    match_rate : 적요의 차량번호가 기준 데이터 차량인 비율
+    reversal_rate : 같은 금액의 - 전표가 따라붙는 비율
+    """
+    rng = np.random.default_rng(seed + 1)
+    picked = base.iloc[rng.integers(0, len(base), n)].reset_index(drop=True)
+
+    # 적요에 들어갈 차량번호: 기준 차량(신/구) 또는 모르는 차량 / 지게차
+    own = np.where(
+        picked["구차량번호"].notna() & (rng.random(n) < 0.3),
+        picked["구차량번호"], picked["신차량번호"]
+    )
+    plate = np.where(rng.random(n) < match_rate, own, random_plates(rng, n))
+    plate = np.where(rng.random(n) < 0.01, "지게차", plate).astype(object)
+    other = random_plates(rng, n)
+    keyword = rng.choice(rule_keywords() + [""] * 10, n)
+
+    form = rng.random(n)
+    spaced = pd.Series(plate).str.replace(r"(\d{4})$", r" \1", regex=True)
+    memo = np.select(
+        [form < 0.4, form < 0.7, form < 0.8, form < 0.95],
+        [
+            pd.Series(plate) + "(" + other + ") " + keyword,
+            keyword + " " + pd.Series(plate) + " 매출",
+            spaced + " 건",
+            keyword + " 외 1건",
+        ],
+        default=None
+    )
+
+    # 판매일자 전후로 기표 (대부분 같은 달)
+    shift = rng.choice([0, 0, 0, 3, 10, 40], n)
+    amount = rng.choice([10_000, 20_000, 35_000, 50_000, 120_000], n)
+
+    ledger = pd.DataFrame({
+        "계정코드": 4100,
+        "계정명": rng.choice(ACCOUNTS, n),
+        "회계일자": picked["판매일자"] + pd.to_timedelta(shift, unit="D"),
+        "NO": np.arange(n),
+        "적요": memo,
+        "거래처코드": rng.integers(1, 500, n),
+        "거래처": rng.choice(vendor_names(), n),
+        "차변": 0,
+        "대변": amount,
+        "작성사원명": "홍길동",
+        "관리항목1": "",
+        "관리항목2": "",
+        "비고란": "",
+    })
+
+    # 취소 전표: 같은 달, 같은 적요, 금액만 반대
+    reversed_rows = ledger[rng.random(n) < reversal_rate].copy()
+    reversed_rows["대변"] = -reversed_rows["대변"]
+    reversed_rows["NO"] += n
+    ledger = pd.concat([ledger, reversed_rows], ignore_index=True)
+    ledger = ledger.sort_values("회계일자", kind="stable", ignore_index=True)
+
+    return add_subtotals(ledger)
+
+
+def add_subtotals(ledger):
+    # ERP 내보내기처럼 월마다 마지막에 월계 / 누계 행 (회계일자 컬럼은 날짜 + 문자열)
+    month = ledger["회계일자"].dt.to_period("M")
+    parts = []
+    for _, part in ledger.groupby(month, sort=True):
+        total = pd.DataFrame({"회계일자": ["월계", "누계"], "대변": part["대변"].sum()})
+        parts += [part.astype({"회계일자": object}), total]
+    return pd.concat(parts, ignore_index=True)[ledger.columns]
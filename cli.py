@@ -0,0 +1,234 @@
+"""손익분석 배치 실행 (Streamlit 없이)
+
+사용 예:
+    python cli.py 기준.xlsx ledgers/ --v11-dir 기타매출/ -o output/
+
+종료 코드:
+    0  모든 파일 처리 완료
+    1  일부 파일 처리 실패 (나머지 결과는 저장됨)
+    2  기준 데이터 / 입력 경로 오류
+"""
+import argparse
+import hashlib
+import logging
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from versions.registry import find_processor, get_processor
+
+from utils.cache import FrameCache
+from utils.excel import read_excel, write_workbook
+from utils.export import EXPORT_FORMATS, write_bundle, write_output
+from utils.executor import run_preprocessors
+from utils.matching import VehicleIndex
+from utils.pipeline import prepare_base, final_merge
+from utils.profiling import StageTimer, log_profile
+
+
+logger = logging.getLogger("car_abc")
+
+
+def list_excel_files(path):
+    path = Path(path)
+    if path.is_file():
+        return [path]
+    # 엑셀 임시 파일(~$...) 제외
+    return sorted(p for p in path.glob("*.xlsx") if not p.name.startswith("~$"))
+
+
+def save_output(df, path, fmt, highlight_after_col=None):
+    path = path.parent / f"{path.name}.{EXPORT_FORMATS[fmt][0]}"
+    write_output(df, path, fmt, highlight_after_col=highlight_after_col)
+    logger.info("저장: %s (%d행)", path, len(df))
+
+
+def run(args):
+    out_dir = Path(args.output)
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    summary = []
+    failed = 0
+    cache = None if args.no_cache else FrameCache()
+
+    # 기준 데이터
+    base_path = Path(args.base)
+    try:
+        base_df = prepare_base(read_excel(base_path, cache=cache))
+    except (OSError, ValueError) as e:
+        logger.error("기준 데이터 오류: %s", e)
+        return 2
+
+    base_index = VehicleIndex(
+        base_df,
+        fingerprint=hashlib.sha256(base_path.read_bytes()).hexdigest(),
+        fuzzy=args.fuzzy,
+        nearest_days=args.nearest_days
+    )
+    logger.info("기준 데이터: %s (%d행)", base_path.name, len(base_df))
+
+    # v1 ~ v8
+    input_files = list_excel_files(args.input)
+    if not input_files:
+        logger.error("입력 파일이 없습니다: %s", args.input)
+        return 2
+
+    # 파일 분류 / 구조 확인 → 작업 목록
+    v11 = get_processor("v11")
+    routed = []
+    for path in input_files:
+        processor = find_processor(path.name)
+        if processor is None:
+            logger.warning("%s: 파일명으로 처리 유형을 판단할 수 없습니다", path.name)
+            summary.append((path.name, "-", "건너뜀", 0, 0))
+            continue
+        routed.append((path, processor))
+
+    if args.v11_dir:
+        routed += [(path, v11) for path in list_excel_files(args.v11_dir)]
+
+    paths = []
+    tasks = []
+    loads = []
+    for path, processor in routed:
+        loader = StageTimer(memory=args.profile)
+        try:
+            df = loader.run("load", read_excel, path, processor.last_column, processor.required_columns, cache)
+        except Exception as e:
+            logger.error("%s: 읽기 오류: %s", path.name, e)
+            summary.append((path.name, processor.name, "실패", 0, 0))
+            failed += 1
+            continue
+
+        if not processor.validate(df):
+            logger.error("%s: 엑셀 구조가 맞지 않습니다", path.name)
+            summary.append((path.name, processor.name, "실패", 0, 0))
+            failed += 1
+            continue
+
+        paths.append(path)
+        tasks.append((processor, df))
+        loads.append(loader.summary()["stages"][0])
+
+    started = time.perf_counter()
+    outputs = run_preprocessors(
+        tasks, base_index, max_workers=args.workers, incremental=args.incremental, profile=args.profile
+    )
+    logger.info("%d개 파일 처리 (%.1f초)", len(tasks), time.perf_counter() - started)
+
+    processed_results = {}
+    transformed_list = []
+
+    for path, (processor, _), load, (result_df, error) in zip(paths, tasks, loads, outputs):
+        if error:
+            logger.error("%s: %s", path.name, error)
+            summary.append((path.name, processor.name, "실패", 0, 0))
+            failed += 1
+            continue
+
+        null_cnt = int(result_df["상품ID"].isna().sum()) if "상품ID" in result_df.columns else 0
+        summary.append((path.name, processor.name, "완료", len(result_df), null_cnt))
+
+        # 단계별 측정 → 로그 + JSON Lines
+        profile = result_df.attrs["프로파일"]
+        log_profile({**profile, "stages": [load] + profile["stages"]}, file=path.name)
+        if profile.get("profile"):
+            logger.info("%s: 가장 느린 단계 %s cProfile → %s", path.name, profile["slowest"], profile["profile"]["path"])
+
+        months = result_df.attrs.get("증분")
+        if months and months["처리"] is not None:
+            logger.info("%s: 월별 결과 재사용 %d개월, 새로 계산 %d개월", path.name, months["재사용"], months["처리"])
+
+        if processor is v11:
+            transformed_list.append(result_df)
+            continue
+
+        save_output(result_df, out_dir / f"{path.stem}_처리본", args.format, highlight_after_col="관리항목2")
+
+        # 같은 유형 파일이 여러 개(월별 등)면 머지용으로 이어 붙임
+        if processor.name in processed_results:
+            result_df = pd.concat(
+                [processed_results[processor.name]["df"], result_df],
+                ignore_index=True
+            )
+        processed_results[processor.name] = {
+            "df": result_df,
+            "merge_key": processor.merge_key
+        }
+
+    # 통합 문서 / zip 에 넣을 결과 {이름: (df, 강조 시작 컬럼)}
+    export_outputs = {name: (item["df"], "관리항목2") for name, item in processed_results.items()}
+
+    # v11 기타매출 집계
+    if transformed_list:
+        final_v11 = pd.concat(transformed_list, ignore_index=True)
+        save_output(final_v11, out_dir / "매출_기타매출_통합", args.format)
+        export_outputs[v11.name] = (final_v11, None)
+
+    # 최종 머지
+    if processed_results and not args.no_merge:
+        try:
+            final_df, report = final_merge(base_df, processed_results)
+        except Exception as e:
+            logger.error("최종 머지 중 오류: %s", e)
+            failed += 1
+        else:
+            for r in report:
+                if r["중복키"]:
+                    logger.warning(
+                        "%s: 상품ID 중복 %d개를 합계로 묶음 (최대 %d행, 그대로 붙였으면 +%d행)",
+                        r["결과"], r["중복키"], r["최대중복"], r["늘어날행"]
+                    )
+            save_output(final_df, out_dir / "최종_머지_결과", args.format, highlight_after_col=base_df.columns[-1])
+            export_outputs["최종"] = (final_df, base_df.columns[-1])
+
+    # 결과별 시트 통합 문서 / 전체 zip
+    if args.workbook and export_outputs:
+        try:
+            write_workbook(export_outputs, out_dir / "손익분석_결과.xlsx")
+            logger.info("저장: %s", out_dir / "손익분석_결과.xlsx")
+        except ValueError as e:
+            logger.error("통합 엑셀 저장 실패: %s", e)
+            failed += 1
+
+    if args.bundle and export_outputs:
+        write_bundle(export_outputs, out_dir / "손익분석_결과.zip", args.format, workbook=False)
+        logger.info("저장: %s", out_dir / "손익분석_결과.zip")
+
+    print_summary(summary)
+    return 1 if failed else 0
+
+
+def print_summary(summary):
+    print()
+    print(f"{'파일':<40} {'유형':<20} {'결과':<6} {'행수':>8} {'상품ID 빈값':>10}")
+    for file_name, processor_name, status, rows, null_cnt in summary:
+        print(f"{file_name:<40} {processor_name:<20} {status:<6} {rows:>8,} {null_cnt:>10,}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="손익분석 배치 실행")
+    parser.add_argument("base", help="기준 엑셀 (상품ID, 판매일자, 신/구차량번호, 판매처)")
+    parser.add_argument("input", help="v1~v8 원장 파일 폴더 (또는 파일 하나)")
+    parser.add_argument("--v11-dir", help="기타매출 집계용 파일 폴더")
+    parser.add_argument("-o", "--output", default="output", help="결과 저장 폴더 (기본: output)")
+    parser.add_argument("-f", "--format", choices=sorted(EXPORT_FORMATS), default="xlsx", help="결과 파일 형식 (기본: xlsx)")
+    parser.add_argument("--workbook", action="store_true", help="결과별 시트를 모은 통합 엑셀도 저장")
+    parser.add_argument("--bundle", action="store_true", help="모든 결과를 zip 하나로도 저장")
+    parser.add_argument("--no-merge", action="store_true", help="최종 머지 파일을 만들지 않음")
+    parser.add_argument("--no-cache", action="store_true", help="파싱 캐시를 쓰지 않음")
+    parser.add_argument("--fuzzy", action="store_true", help="상품ID 를 못 찾은 행에 유사 차량번호 후보 컬럼 추가")
+    parser.add_argument("--nearest-days", type=int, default=0, help="같은 달에 못 찾은 행을 판매일자 ±N일 안의 가장 가까운 차량에 매칭 (매칭구분='인접월')")
+    parser.add_argument("--incremental", action="store_true", help="저장된 월별 결과를 재사용하고 바뀐 월만 처리")
+    parser.add_argument("--profile", action="store_true", help="단계별 메모리 측정 + 가장 느린 단계 cProfile 저장 (느려짐)")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="동시 처리 프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
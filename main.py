@@ -1,19 +1,23 @@
+import hashlib
+import uuid
+from pathlib import Path
+
 import streamlit as st
 import pandas as pd
 
-from versions.v1 import PreprocessV1
-from versions.v2 import PreprocessV2
-from versions.v3 import PreprocessV3
-from versions.v4 import PreprocessV4
-from versions.v5 import PreprocessV5
-from versions.v6 import PreprocessV6
-from versions.v7 import PreprocessV7
-from versions.v8 import PreprocessV8
-# from versions.v9 import PreprocessV9
-# from versions.v10 import PreprocessV10
-from versions.v11 import PreprocessV11
+from versions.registry import SPECS, find_processor, get_processor
 
-from utils.excel import to_excel_with_format
+from utils.cache import FrameCache
+from utils.excel import read_excel, to_excel_with_format
+from utils.export import EXPORT_FORMATS, bundle_bytes, output_bytes, workbook_bytes
+from utils.executor import process_file
+from utils.incremental import code_fingerprint
+from utils.jobs import JOB_POLL_SECONDS, JobManager
+from utils.matching import VehicleIndex
+from utils.pipeline import prepare_base, final_merge
+from utils.store import SessionStores
+from utils.summary import SUMMARY_DIMENSIONS, SUMMARY_MEASURES, SummaryCube
+from utils.ue import UE_ITEMS, build_ue
 
 
 # =========================
@@ -31,9 +35,69 @@ div[data-baseweb="tab-list"] {
 # 🔥 여기만 추가
 tab1, tab2, tab3 = st.tabs(["매출", "UE", "summary"])
 
-@st.cache_data
-def load_excel(file):
-    return pd.read_excel(file)
+# 파싱한 엑셀은 로컬 Parquet 캐시에 보관 (서버 재시작 후에도 유지, 크기 제한 + LRU)
+frame_cache = FrameCache()
+
+
+def load_excel(file, last_column=None, required_columns=None):
+    return read_excel(file, last_column, required_columns, cache=frame_cache)
+
+
+@st.cache_resource(max_entries=4)
+def load_base(file_hash, _file):
+    # 같은 기준 파일(내용 해시)이면 다시 실행돼도 읽기 + prepare_base 를 건너뜀
+    # (Parquet 캐시 앞의 메모리 단계, 여러 세션이 같이 쓰므로 바꾸지 말 것)
+    return prepare_base(load_excel(_file))
+
+
+@st.cache_resource(max_entries=4)
+def build_vehicle_index(file_hash, _base_df, fuzzy=False, nearest_days=0):
+    # 같은 기준 파일(내용 해시) + 같은 옵션이면 인덱스를 다시 만들지 않음
+    # (기준 파일 / 옵션 조합마다 쌓이지 않도록 최근 4개만 유지)
+    return VehicleIndex(_base_df, fingerprint=file_hash, fuzzy=fuzzy, nearest_days=nearest_days)
+
+
+def result_view(result_df, error, key):
+    # 화면에 보여줄 것만 미리 뽑아 둠 (다시 실행될 때 결과 전체를 꺼내지 않음)
+    if error:
+        return {"token": key, "error": error}
+
+    counts = ""
+    if "상품ID" in result_df.columns:
+        total = len(result_df)
+        null_cnt = result_df["상품ID"].isna().sum()
+        dup_cnt = result_df["상품ID"].duplicated().sum()
+        valid_cnt = total - null_cnt
+        counts = f"✅ 정상 {valid_cnt:,}건 ｜ ⚠️ 빈값 {null_cnt:,}건 ｜ 🔁 중복 {dup_cnt:,}건"
+        if "후보상품ID" in result_df.columns:
+            counts += f" ｜ 🔎 후보 {result_df['후보상품ID'].notna().sum():,}건"
+        if "매칭구분" in result_df.columns:
+            counts += f" ｜ 📅 인접월 {(result_df['매칭구분'] == '인접월').sum():,}건"
+
+    return {
+        "token": key, "error": None,
+        "attrs": dict(result_df.attrs), "head": result_df.head(20), "counts": counts
+    }
+
+
+@st.fragment(run_every=JOB_POLL_SECONDS)
+def job_progress(job, name):
+    # 진행 중인 작업의 진행률만 다시 그림 (전체 화면은 작업이 끝났을 때 한 번만 다시 실행해서 결과를 받음)
+    if job.done:
+        st.rerun()
+    st.progress(job.progress, text=f"{name} {job.state} {job.step} ({job.seconds:.0f}초)")
+
+
+@st.cache_resource
+def job_manager():
+    # 서버 프로세스에 하나: 파일 처리용 백그라운드 작업 (입력 해시로 찾음)
+    return JobManager()
+
+
+@st.cache_resource
+def session_stores():
+    # 서버 프로세스에 하나: 세션별 결과 보관소 (메모리 예산 초과분은 파일로, 오래 안 쓴 세션은 정리)
+    return SessionStores()
 
 
 with tab1:
@@ -41,10 +105,33 @@ with tab1:
     # =========================
     # session_state 초기화
     # =========================
-    if "processed_results" not in st.session_state:
-        st.session_state.processed_results = {}
+    # 처리 결과는 세션 id 로 찾는 ResultStore 에 보관 (dict 처럼 사용)
+    # 기타매출 집계 / 최종 머지 / UE 도 '_' 이름으로 같은 보관소에 둠 (같은 메모리 예산)
+    if "session_id" not in st.session_state:
+        st.session_state.session_id = uuid.uuid4().hex
+
+    processed_results = session_stores().get(st.session_state.session_id)
+
+    V11_RESULT, FINAL_RESULT, UE_RESULT = "_기타매출", "_최종", "_UE"
+
+    def stored_df(name):
+        item = processed_results.get(name)
+        return item["df"] if item is not None else None
+
+    # 요약 탭용 집계 cube (결과가 끝날 때 한 번만 묶어 둠)
+    if "summary_cube" not in st.session_state:
+        st.session_state.summary_cube = SummaryCube()
+
+    summary_cube = st.session_state.summary_cube
 
-    processed_results = st.session_state.processed_results
+    # 파일별 화면 요약 (작업 key → 요약, 결과를 넘겨받을 때 한 번 만듦)
+    if "result_views" not in st.session_state:
+        st.session_state.result_views = {}
+
+    result_views = st.session_state.result_views
+
+    # 백그라운드 파일 처리 작업 (진행 중인 작업은 job_progress 가 따로 확인)
+    jobs = job_manager()
 
 
     # =========================
@@ -58,21 +145,28 @@ with tab1:
         key="base"
     )
 
+    fuzzy_match = st.checkbox(
+        "못 찾은 차량번호의 유사 후보 찾기 (지역명 / 한 글자 오타, 후보상품ID · 후보신뢰도 컬럼 추가)",
+        value=False
+    )
+
+    nearest_days = st.number_input(
+        "인접월 매칭 허용 일수 (같은 달에 못 찾으면 판매일자가 가장 가까운 차량에 매칭, 0 = 사용 안 함)",
+        min_value=0, max_value=31, value=0, step=1
+    )
+
     base_df = None
+    base_index = None
 
     if base_file:
-        base_df = load_excel(base_file)
-
-        # 필수 컬럼 방어
-        required_cols = ["상품ID", "판매일자"]
-        missing = set(required_cols) - set(base_df.columns)
-        if missing:
-            st.error(f"기준 데이터에 필수 컬럼이 없습니다: {missing}")
+        base_hash = hashlib.sha256(base_file.getvalue()).hexdigest()
+        try:
+            base_df = load_base(base_hash, base_file)
+        except ValueError as e:
+            st.error(str(e))
             st.stop()
 
-        base_df["판매일자"] = pd.to_datetime(base_df["판매일자"])
-        base_df["판매연도"] = base_df["판매일자"].dt.year
-        base_df["판매월"] = base_df["판매일자"].dt.month
+        base_index = build_vehicle_index(base_hash, base_df, fuzzy_match, int(nearest_days))
 
         st.success("기준 데이터 업로드 완료")
         st.dataframe(base_df.head(10))
@@ -83,88 +177,163 @@ with tab1:
     # =========================
     st.header("2️⃣ 상품매출, 수입수수료")
 
-    PROCESSOR_RULES = [
-        ("상품매출", PreprocessV1()),
-        ("원상회복비", PreprocessV2()),
-        ("기타수수료", PreprocessV3()),
-        ("매도비", PreprocessV4()),
-        ("낙찰수수료", PreprocessV5()),
-        ("위탁판매수수료", PreprocessV6()),
-        ("상품화", PreprocessV7()),
-        ("평가사수수료", PreprocessV8()),
-    ]
-
     uploaded_files = st.file_uploader(
         "엑셀 파일들을 한 번에 업로드하세요",
         type=["xlsx"],
         accept_multiple_files=True
     )
 
+    incremental = st.checkbox(
+        "증분 처리 (지난 달 결과 재사용, 새로 생기거나 바뀐 월만 계산)",
+        value=True
+    )
+
+    profile_mode = st.checkbox(
+        "상세 프로파일 (단계별 메모리 + 가장 느린 단계 cProfile, 처리 느려짐)",
+        value=False
+    )
+
     if base_df is not None and uploaded_files:
 
+        # 파일마다 읽기 + 전처리를 백그라운드 작업으로 넘김
+        # (입력 해시가 같으면 진행 중이거나 끝난 작업을 그대로 받음 → 다시 실행돼도 버리지 않음)
+        # 같은 유형 파일이 여러 개(월별 등)면 다 끝난 뒤 이어 붙여 유형 이름 하나로 보관 (cli.py 와 같음)
+        groups = {}
+        unmatched = []
         for file in uploaded_files:
+            matched_processor = find_processor(file.name)
+            if matched_processor is None:
+                unmatched.append(file)
+                continue
 
-            file_name = file.name
-            st.subheader(f"📄 {file_name}")
+            data = file.getvalue()
+            key = jobs.make_key(
+                base_index.fingerprint, hashlib.sha256(data).hexdigest(), matched_processor.name,
+                incremental, profile_mode, code_fingerprint()
+            )
+            groups.setdefault(matched_processor.name, (matched_processor, []))[1].append((file, data, key))
 
-            matched_processor = None
-            for keyword, processor in PROCESSOR_RULES:
-                if keyword in file_name:
-                    matched_processor = processor
-                    break
+        for name, (matched_processor, files) in groups.items():
+            token = tuple(key for _, _, key in files)
 
-            if matched_processor is None:
-                st.warning("⚠️ 파일명으로 처리 유형을 판단할 수 없습니다")
-                continue
+            # 이미 넘겨받은 결과면 작업을 다시 찾지 않고 화면 요약(result_views)만 씀
+            stored = processed_results.token(name) == token and all(key in result_views for key in token)
+            finished = []
+            waiting = failed = False
 
-            df = load_excel(file)
+            for file, data, key in files:
 
-            if not matched_processor.validate(df):
-                st.error("❌ 엑셀 구조가 맞지 않습니다")
-                continue
+                st.subheader(f"📄 {file.name}")
 
-            try:
-                result_df = matched_processor.preprocess(df, base_df)
-            except Exception as e:
-                st.error(f"처리 중 오류: {e}")
-                continue
+                if not stored:
+                    job = jobs.submit(
+                        key,
+                        process_file, matched_processor, data, base_index, load_excel,
+                        incremental, profile_mode, file.name,
+                        label=file.name
+                    )
 
-            st.success(f"✅ {matched_processor.name} 처리 완료")
-
-            # 상품ID 요약
-            if "상품ID" in result_df.columns:
-                total = len(result_df)
-                null_cnt = result_df["상품ID"].isna().sum()
-                dup_cnt = result_df["상품ID"].duplicated().sum()
-                valid_cnt = total - null_cnt
-
-                st.markdown(
-                    f"""
-                    <div style="padding:8px;background:#F5F7FA;border-radius:6px">
-                    ✅ 정상 {valid_cnt:,}건 ｜ ⚠️ 빈값 {null_cnt:,}건 ｜ 🔁 중복 {dup_cnt:,}건
-                    </div>
-                    """,
-                    unsafe_allow_html=True
-                )
+                    if not job.done:
+                        waiting = True
+                        job_progress(job, name)
+                        continue
+
+                    # 실패한 작업은 화면 요약을 남기지 않음 → 다음 실행 때 다시 돌림
+                    if job.error:
+                        failed = True
+                        st.error(job.error)
+                        continue
+
+                    finished.append(job)
+                    if key not in result_views:
+                        result_views[key] = result_view(*job.result, key)
+
+                view = result_views[key]
+                if view["error"]:
+                    st.error(view["error"])
+                    continue
+
+                st.success(f"✅ {name} 처리 완료")
+
+                months = view["attrs"].get("증분")
+                if months and months["처리"] is not None:
+                    st.caption(f"월별 결과 재사용 {months['재사용']}개월 ｜ 새로 계산 {months['처리']}개월")
+
+                # 단계별 소요 시간 (읽기 + 전처리 단계, 로그는 작업이 끝날 때 남김)
+                profile = view["attrs"].get("프로파일")
+                if profile:
+                    with st.expander(
+                        f"⏱ 단계별 소요 시간 ｜ 전체 {profile['total']:.2f}초 ｜ 가장 느린 단계: {profile['slowest']}"
+                    ):
+                        st.dataframe(pd.DataFrame(profile["stages"]), hide_index=True)
+
+                        detail = profile.get("profile")
+                        if detail:
+                            st.caption(f"cProfile: {detail['stage']} 단계 (누적 시간 상위 20개)")
+                            st.code(detail["top"])
+                            st.download_button(
+                                "⬇ cProfile 통계 (.prof)",
+                                data=lambda path=detail["path"]: Path(path).read_bytes(),
+                                file_name=Path(detail["path"]).name,
+                                key=f"prof_{file.name}",
+                                on_click="ignore"
+                            )
+
+                # 상품ID 요약
+                if view["counts"]:
+                    st.markdown(
+                        f"""
+                        <div style="padding:8px;background:#F5F7FA;border-radius:6px">
+                        {view["counts"]}
+                        </div>
+                        """,
+                        unsafe_allow_html=True
+                    )
 
-            st.dataframe(result_df.head(20))
+                st.dataframe(view["head"])
+
+            # 같은 유형 파일이 다 끝나면 이어 붙여 session 저장 → 작업에서는 결과를 놓음
+            # (메모리 예산은 세션 보관소가 관리)
+            if not stored and not waiting and not failed:
+                # 구조 오류 등으로 결과가 없는 작업은 놓지 않음 (다음 실행 때 다시 읽지 않도록)
+                done = [job for job in finished if job.result[1] is None]
+                results = [job.result[0] for job in done]
+                if results:
+                    result_df = results[0] if len(results) == 1 else pd.concat(results, ignore_index=True)
+                    processed_results[name] = {
+                        "df": result_df,
+                        "merge_key": matched_processor.merge_key,
+                        "token": token
+                    }
+                    summary_cube.add(name, result_df, token=token, index=base_index)
+                elif name in processed_results:
+                    del processed_results[name]
+                    summary_cube.remove(name)
+                for job in done:
+                    jobs.release(job.key)
+
+            # 다운로드 (엑셀 파일은 버튼을 눌렀을 때 만듦, 파일로 내려 둔 결과도 그때 읽음)
+            if processed_results.token(name) == token:
+                st.download_button(
+                    label=f"⬇ {name} 결과 다운로드" + (f" (파일 {len(files)}개 합침)" if len(files) > 1 else ""),
+                    data=lambda name=name: to_excel_with_format(
+                        processed_results[name]["df"],
+                        highlight_after_col="관리항목2"
+                    ),
+                    file_name=f"{name}_처리본.xlsx",
+                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                    on_click="ignore"
+                )
 
-            # session 저장
-            st.session_state.processed_results[matched_processor.name] = {
-                "df": result_df,
-                "merge_key": matched_processor.merge_key
-            }
+        for file in unmatched:
+            st.subheader(f"📄 {file.name}")
+            st.warning("⚠️ 파일명으로 처리 유형을 판단할 수 없습니다")
 
-            # 다운로드
-            st.download_button(
-                label=f"⬇ {matched_processor.name} 결과 다운로드",
-                data=to_excel_with_format(
-                    result_df,
-                    highlight_after_col="관리항목2"
-                ),
-                file_name=f"{matched_processor.name}_처리본.xlsx",
-                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-            )
+        # 지금 올린 파일이 아닌 화면 요약은 버림
+        current = {key for _, files in groups.values() for _, _, key in files}
+        for key in list(result_views):
+            if key not in current:
+                del result_views[key]
 
 
     # =========================
@@ -172,8 +341,6 @@ with tab1:
     # =========================
     st.header("3️⃣ 기타매출 집계")
 
-    v11 = PreprocessV11()
-
     v11_files = st.file_uploader(
         "기타매출 집계용 파일 업로드",
         type=["xlsx"],
@@ -181,33 +348,39 @@ with tab1:
         key="v11"
     )
 
-if v11_files and base_df is not None:
+    if v11_files and base_df is not None:
 
-    transformed_list = []
+        # 기타매출 파일이 있을 때만 전처리기를 불러옴 (모듈 import 는 처음 한 번)
+        v11 = get_processor("v11")
+        transformed_list = []
 
-    for file in v11_files:
+        for file in v11_files:
 
-        df = load_excel(file)
+            df = load_excel(file, v11.last_column, v11.required_columns)
 
-        if not v11.validate(df):
-            st.warning(f"{file.name} 구조 불일치")
-            continue
+            if not v11.validate(df):
+                st.warning(f"{file.name} 구조 불일치")
+                continue
 
-        transformed = v11.preprocess(df, base_df)
-        transformed_list.append(transformed)
+            transformed = v11.preprocess(df, base_df, index=base_index)
+            transformed_list.append(transformed)
 
-    if transformed_list:
+        if transformed_list:
 
-        final_v11 = pd.concat(transformed_list, ignore_index=True)
+            final_v11 = pd.concat(transformed_list, ignore_index=True)
+            v11_token = (base_index.fingerprint, *(hashlib.sha256(file.getvalue()).hexdigest() for file in v11_files))
+            processed_results[V11_RESULT] = {"df": final_v11, "token": v11_token}
+            summary_cube.add(v11.name, final_v11, token=v11_token, index=base_index)
 
-        st.success("✅ 기타매출 집계 완료")
-        st.dataframe(final_v11.head(20))
+            st.success("✅ 기타매출 집계 완료")
+            st.dataframe(final_v11.head(20))
 
-        st.download_button(
-            "⬇ 기타매출 결과 다운로드",
-            data=to_excel_with_format(final_v11),
-            file_name="매출_기타매출_통합.xlsx"
-        )
+            st.download_button(
+                "⬇ 기타매출 결과 다운로드",
+                data=lambda: to_excel_with_format(final_v11),
+                file_name="매출_기타매출_통합.xlsx",
+                on_click="ignore"
+            )
 
 
     # =========================
@@ -215,37 +388,153 @@ if v11_files and base_df is not None:
     # =========================
     st.header("4️⃣ 최종 매출 파일")
 
-    if base_df is not None and st.session_state.processed_results:
+    if base_df is not None and processed_results:
 
-        if st.button("▶ 최종 머지 실행"):
+        spilled = processed_results.spilled()
+        if spilled:
+            st.caption(f"💾 메모리 절약을 위해 파일로 내려 둔 결과 {len(spilled)}개는 머지할 때 다시 읽습니다")
 
-            final_df = base_df.copy()
+        if st.button("▶ 최종 머지 실행"):
 
-            for item in st.session_state.processed_results.values():
-                if item["merge_key"]:
-                    final_df = final_df.merge(
-                        item["df"],
-                        on=item["merge_key"],
-                        how="left"
-                    )
+            final_df, report = final_merge(base_df, processed_results)
+            processed_results[FINAL_RESULT] = {"df": final_df}
 
             st.success("🎉 최종 머지 완료")
+
+            # 상품ID 중복은 합계로 묶었음 (그대로 붙였으면 행이 늘어났을 것)
+            fanout = [r for r in report if r["중복키"]]
+            if fanout:
+                st.warning(
+                    "🔁 상품ID 중복 행은 합계로 묶어 붙였습니다 ｜ "
+                    + " ｜ ".join(f"{r['결과']} {r['중복키']:,}개 (+{r['늘어날행']:,}행)" for r in fanout)
+                )
+
             st.dataframe(final_df.head(20))
 
             st.download_button(
                 "⬇ 최종 머지 결과 다운로드",
-                data=to_excel_with_format(
+                data=lambda: to_excel_with_format(
                     final_df,
-                    highlight_after_col="관리항목2"
+                    highlight_after_col=base_df.columns[-1]
                 ),
-                file_name="최종_머지_결과.xlsx"
+                file_name="최종_머지_결과.xlsx",
+                on_click="ignore"
+            )
+
+
+    # =========================
+    # 5️⃣ 전체 결과 내보내기
+    # =========================
+    st.header("5️⃣ 전체 결과 내보내기")
+
+    # 이름: (df 를 돌려주는 함수, 강조 시작 컬럼) — 처리 결과, 기타매출 집계, 최종 머지
+    # 파일로 내려 둔 처리 결과는 다운로드할 때만 읽음
+    export_sources = {
+        name: (lambda name=name: processed_results[name]["df"], "관리항목2")
+        for name in processed_results
+    }
+    if V11_RESULT in processed_results:
+        export_sources[SPECS["v11"].name] = (lambda: stored_df(V11_RESULT), None)
+    if base_df is not None and FINAL_RESULT in processed_results:
+        export_sources["최종"] = (lambda: stored_df(FINAL_RESULT), base_df.columns[-1])
+
+    def export_outputs():
+        return {name: (load(), highlight) for name, (load, highlight) in export_sources.items()}
+
+    if export_sources:
+
+        export_format = st.radio(
+            "형식",
+            ["xlsx (시트별 통합)", "csv", "parquet", "zip (전체 묶음)"],
+            horizontal=True
+        )
+
+        # 파일은 다운로드 버튼을 눌렀을 때 만듦
+        if export_format == "xlsx (시트별 통합)":
+            st.download_button(
+                "⬇ 통합 엑셀 다운로드",
+                data=lambda: workbook_bytes(export_outputs()),
+                file_name="손익분석_결과.xlsx",
+                mime=EXPORT_FORMATS["xlsx"][1],
+                on_click="ignore"
             )
+        elif export_format == "zip (전체 묶음)":
+            st.download_button(
+                "⬇ 전체 결과 zip 다운로드 (parquet + 통합 엑셀)",
+                data=lambda: bundle_bytes(export_outputs(), "parquet"),
+                file_name="손익분석_결과.zip",
+                mime="application/zip",
+                on_click="ignore"
+            )
+        else:
+            ext, mime = EXPORT_FORMATS[export_format]
+            for name, (load, _) in export_sources.items():
+                st.download_button(
+                    f"⬇ {name} ({ext})",
+                    data=lambda load=load: output_bytes(load(), ext),
+                    file_name=f"{name}.{ext}",
+                    mime=mime,
+                    on_click="ignore"
+                )
 
 
 # UE
 with tab2:
-    st.info("아직 준비중이다")
+
+    # 상품ID 당 매출 / 비용 항목 / 마진 (취소 행 제외)
+    ue_names = [name for name in processed_results if name in {SPECS[key].name for key, _ in UE_ITEMS}]
+
+    if not ue_names:
+        st.info("매출 탭에서 상품매출 / 수수료 파일을 처리하면 차량별 UE 를 계산할 수 있습니다")
+    else:
+        st.caption("포함 결과: " + ", ".join(ue_names))
+
+        if st.button("▶ UE 계산"):
+            processed_results[UE_RESULT] = {"df": build_ue(processed_results, index=base_index)}
+
+        ue_df = stored_df(UE_RESULT)
+        if ue_df is not None:
+            col_count, col_revenue, col_margin = st.columns(3)
+            col_count.metric("차량 수", f"{len(ue_df):,}")
+            col_revenue.metric("매출", f"{ue_df['상품매출'].sum():,.0f}")
+            col_margin.metric("마진", f"{ue_df['마진'].sum():,.0f}")
+
+            st.dataframe(ue_df.head(100))
+
+            st.download_button(
+                "⬇ UE 다운로드",
+                data=lambda: to_excel_with_format(ue_df),
+                file_name="차량별_UE.xlsx",
+                on_click="ignore"
+            )
 
 # 🔥 summary
 with tab3:
-    st.info("아직 준비중이다")
+
+    # 필터 / 피벗은 처리 때 묶어 둔 cube 에서만 계산 (원장을 다시 묶지 않음)
+    if not len(summary_cube):
+        st.info("매출 탭에서 파일을 처리하면 결과별 손익 요약이 여기에 표시됩니다")
+    else:
+        st.caption(f"결과 {len(summary_cube)}개 ｜ 집계 {len(summary_cube.cube):,}행")
+
+        with st.expander("필터", expanded=False):
+            filters = {
+                dim: st.multiselect(dim, summary_cube.values(dim), key=f"summary_filter_{dim}")
+                for dim in ["결과"] + SUMMARY_DIMENSIONS
+            }
+
+        col_rows, col_columns, col_value = st.columns(3)
+        rows = col_rows.multiselect("행", ["결과"] + SUMMARY_DIMENSIONS, default=["회계연도", "회계월"])
+        columns = col_columns.selectbox("열", [None, "결과"] + SUMMARY_DIMENSIONS, index=1,
+                                        format_func=lambda c: "(없음)" if c is None else c)
+        value = col_value.selectbox("값", SUMMARY_MEASURES, index=SUMMARY_MEASURES.index("순액"))
+
+        pivot = summary_cube.query(rows, columns, value, filters)
+        st.dataframe(pivot)
+
+        st.download_button(
+            "⬇ 요약 다운로드",
+            data=lambda pivot=pivot: to_excel_with_format(pivot.reset_index()),
+            file_name="손익_요약.xlsx",
+            on_click="ignore"
+        )
@@ -0,0 +1,28 @@
+import io
+
+import numpy as np
+import pandas as pd
+
+from utils import excel
+from utils.excel import write_excel
+
+
+def test_write_excel_inf_and_chunks(monkeypatch):
+    # 청크 경계를 넘는 행 수 + inf / NaN 이 섞인 컬럼
+    monkeypatch.setattr(excel, "WRITE_CHUNK_ROWS", 3)
+    df = pd.DataFrame({
+        "차량번호": ["12가3456", None, "34나5678", "56다7890", "78라1234"],
+        "금액": [1.5, np.inf, -np.inf, np.nan, 2.0],
+    })
+
+    output = io.BytesIO()
+    write_excel(df, output)
+    output.seek(0)
+    result = pd.read_excel(output, engine="openpyxl")
+
+    assert list(result.columns) == ["차량번호", "금액"]
+    assert len(result) == len(df)
+    assert result["차량번호"].tolist()[2:] == ["34나5678", "56다7890", "78라1234"]
+    assert pd.isna(result.loc[1, "차량번호"])
+    assert result.loc[0, "금액"] == 1.5 and result.loc[4, "금액"] == 2.0
+    assert pd.isna(result.loc[3, "금액"])
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+import uuid
+from datetime import date, datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+CACHE_DIR = Path(os.environ.get("CAR_ABC_CACHE_DIR", Path.home() / ".cache" / "car_abc"))
+CACHE_MAX_BYTES = int(os.environ.get("CAR_ABC_CACHE_MAX_MB", "2048")) * 1024 * 1024
+
+# 세션 결과 폴더 (utils.store) — 캐시 정리 때 지우지 않음
+SESSION_SUBDIR = "sessions"
+
+# 저장 형식이 바뀌면 올려서 예전 캐시를 무효화
+CACHE_FORMAT = 2
+
+_META_KEY = b"car_abc"
+
+
+def _kind(value):
+    # 한 컬럼에 섞여 있는 값의 종류 (엑셀의 회계일자: 날짜 + '월계'/'누계' 등)
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return None
+    if isinstance(value, (datetime, date)):
+        return "datetime"
+    if isinstance(value, (bool, np.bool_)):
+        return "bool"
+    if isinstance(value, (int, np.integer)):
+        return "int"
+    if isinstance(value, (float, np.floating)):
+        return "float"
+    if isinstance(value, str):
+        return "str"
+    return "other"
+
+
+_KIND_DTYPES = {
+    "datetime": "datetime64[ns]",
+    "bool": "boolean",
+    "int": "Int64",
+    "float": "float64",
+    "str": object,
+}
+
+
+def _to_table(df):
+    """DataFrame → Arrow 테이블
+
+    타입이 섞인 object 컬럼은 종류별 하위 컬럼으로 나눠 저장하고
+    메타데이터에 남겨서 읽을 때 원래 값(날짜, 숫자, 문자열)으로 되돌린다.
+    """
+    columns = {}
+    mixed = {}
+
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object:
+            try:
+                pa.array(s, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                kinds = s.map(_kind)
+                found = list(kinds.dropna().unique())
+                if "other" in found:
+                    raise TypeError(f"캐시할 수 없는 값이 있습니다: {col}")
+
+                mixed[col] = found
+                for k in found:
+                    columns[f"{col}::{k}"] = s.where(kinds == k).astype(_KIND_DTYPES[k])
+                continue
+        columns[col] = s
+
+    frame = pd.DataFrame({k: v.reset_index(drop=True) for k, v in columns.items()})
+    frame.index = df.index
+    table = pa.Table.from_pandas(frame)
+    meta = {"columns": list(df.columns), "mixed": mixed}
+    return table.replace_schema_metadata({
+        **(table.schema.metadata or {}),
+        _META_KEY: json.dumps(meta, ensure_ascii=False).encode(),
+    })
+
+
+def _from_table(table):
+    meta = json.loads(table.schema.metadata[_META_KEY])
+    stored = table.to_pandas()
+
+    for col, kinds in meta["mixed"].items():
+        values = np.full(len(stored), None, dtype=object)
+        for k in kinds:
+            part = stored.pop(f"{col}::{k}")
+            mask = part.notna().to_numpy()
+            values[mask] = part[mask].astype(object).to_numpy()
+        stored[col] = values
+
+    return stored[meta["columns"]]
+
+
+class FrameCache:
+    """파싱한 DataFrame 을 로컬 Parquet 파일로 보관하는 캐시
+
+    키는 원본 바이트 + 읽기 설정의 SHA-256.
+    서버를 재시작해도 남아 있고, 하위 폴더까지 합친 크기가 max_bytes 를 넘으면
+    가장 오래 안 쓴 파일부터 지운다 (LRU, 파일 mtime 기준).
+    """
+
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+
+    @staticmethod
+    def make_key(data, **settings):
+        h = hashlib.sha256(data)
+        settings = {**settings, "format": CACHE_FORMAT, "pandas": pd.__version__}
+        h.update(json.dumps(settings, sort_keys=True, default=str).encode())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return self.directory / f"{key}.parquet"
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            table = pq.read_table(path)
+        except (FileNotFoundError, pa.ArrowInvalid, OSError):
+            return None
+
+        if _META_KEY not in (table.schema.metadata or {}):
+            return None
+
+        os.utime(path)  # LRU: 최근 사용 시각 갱신
+        return _from_table(table)
+
+    def put(self, key, df):
+        # 컬럼명이 문자열이 아니거나 Arrow 로 못 바꾸는 값이 있으면 캐시하지 않음
+        if not all(isinstance(c, str) for c in df.columns):
+            return False
+        try:
+            table = _to_table(df)
+        except (TypeError, pa.ArrowInvalid, pa.ArrowTypeError):
+            return False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        tmp = self.directory / f".{key}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(table, tmp)
+        os.replace(tmp, self._path(key))
+
+        self.evict()
+        return True
+
+    def evict(self):
+        # 하위 폴더(월별 결과 partitions/, 프로파일 profiles/ 등)까지 합쳐서 크기를 잼
+        # sessions/ 는 지금 쓰는 세션 결과라 크기에만 넣고 지우지 않음 (SessionStores 가 정리)
+        # 쓰는 중인 임시 파일('.' 으로 시작)은 건드리지 않음
+        files = []
+        total = 0
+        for path in self.directory.rglob("*"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if not path.is_file():
+                continue
+            total += stat.st_size
+            relative = path.relative_to(self.directory)
+            if relative.parts[0] != SESSION_SUBDIR and not path.name.startswith("."):
+                files.append((stat.st_mtime, stat.st_size, path))
+
+        for _, size, path in sorted(files):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
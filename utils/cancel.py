@@ -0,0 +1,78 @@
+import numpy as np
+import pandas as pd
+
+
+def row_reference(df, columns=('회계일자', 'NO')):
+    # 내려받은 파일에서 행을 찾을 수 있는 표시 (예: '2024-03-05 NO 12')
+    # 회계일자 / NO 가 없으면 행 인덱스
+    parts = []
+    for col in columns:
+        if col not in df.columns:
+            continue
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            text = values.dt.strftime('%Y-%m-%d')
+        elif pd.api.types.is_numeric_dtype(values):
+            text = values.astype('Int64').astype(str)
+        else:
+            text = values.astype(str)
+        parts.append(text if col == '회계일자' else f'{col} ' + text)
+
+    if not parts:
+        return pd.Series(df.index.astype(str), index=df.index)
+    return parts[0].str.cat(parts[1:], sep=' ') if len(parts) > 1 else parts[0]
+
+
+def find_cancellations(df, plate_col, amount_col='대변', keys=('회계연도', '회계월')):
+    """같은 (연도, 월, 차량번호) 안에서 금액 크기가 같은 +/- 전표를 짝지음
+
+    기존 취소 로직(cumcount → transform('count'))과 같은 결과를 정렬 한 번으로 만든다.
+    같은 크기의 + 와 - 는 나온 순서대로 1:1 로 짝지어지고,
+    짝이 있는 행은 '취소', '취소상대' 에 상대 행의 회계일자 + NO(row_reference)를 남긴다.
+    차량번호나 금액이 비어 있는 행은 짝을 찾지 않는다.
+    """
+    amount = df[amount_col]
+    columns = [df[k] for k in keys] + [df[plate_col], amount.abs()]
+    codes = [pd.factorize(c)[0] for c in columns]   # NaN → -1
+
+    valid = np.logical_and.reduce([c >= 0 for c in codes])
+    positive = (amount > 0).to_numpy()
+
+    # 키 → 부호(0 이하 먼저) → 원래 순서로 정렬
+    rows = np.flatnonzero(valid)
+    order = rows[np.lexsort([rows, positive[rows]] + [c[rows] for c in reversed(codes)])]
+
+    n = len(order)
+    pos = np.arange(n)
+    sorted_keys = np.column_stack([c[order] for c in codes])
+    sorted_positive = positive[order]
+
+    new_key = np.ones(n, dtype=bool)
+    new_key[1:] = (sorted_keys[1:] != sorted_keys[:-1]).any(axis=1)
+    new_run = new_key.copy()
+    new_run[1:] |= sorted_positive[1:] != sorted_positive[:-1]
+
+    key_start = np.maximum.accumulate(np.where(new_key, pos, 0))
+    run_start = np.maximum.accumulate(np.where(new_run, pos, 0))
+    rank = pos - run_start
+
+    key_id = np.cumsum(new_key) - 1
+    key_size = np.bincount(key_id, minlength=1)
+    neg_size = np.bincount(key_id, weights=~sorted_positive, minlength=1).astype(int)
+    n_neg = neg_size[key_id]
+    n_pos = key_size[key_id] - n_neg
+
+    # 키 블록 안에서 (0 이하 블록) 다음에 (양수 블록), 같은 순번끼리 짝
+    partner = np.where(sorted_positive, key_start + rank, key_start + n_neg + rank)
+    paired = np.where(sorted_positive, rank < n_neg, rank < n_pos)
+
+    canceled = np.zeros(len(df), dtype=bool)
+    canceled[order[paired]] = True
+
+    partners = order[partner[paired]]
+    partner_ref = pd.Series(
+        row_reference(df.iloc[partners]).to_numpy(dtype=object),
+        index=df.index[order[paired]],
+    ).reindex(df.index)
+
+    return pd.DataFrame({'취소': canceled, '취소상대': partner_ref}, index=df.index)
@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+
+
+# 엑셀을 읽은 직후 적용하는 컬럼 dtype 정책
+# - 값 종류가 적은 컬럼 → category
+# - 긴 문자열 / 키 → Arrow 문자열 (빈값은 NaN 그대로, 비교 결과는 numpy bool)
+# - 연도 / 월 → int16 (빈값이 없을 때만)
+CATEGORY_COLUMNS = ["계정명", "거래처", "작성사원명", "판매처", "관리항목1", "관리항목2"]
+STRING_COLUMNS = ["적요", "상품ID", "신차량번호", "구차량번호"]
+SMALL_INT_COLUMNS = ["판매연도", "판매월", "회계연도", "회계월"]
+
+# 고유값 비율이 이보다 크면 category 로 바꿔도 이득이 없음
+CATEGORY_MAX_RATIO = 0.5
+
+
+def _arrow_string_dtype():
+    # pandas 2.3+: StringDtype("pyarrow", na_value=np.nan) / 2.1~2.2: "pyarrow_numpy"
+    try:
+        return pd.StringDtype("pyarrow", na_value=np.nan)
+    except TypeError:
+        pass
+    try:
+        return pd.StringDtype("pyarrow_numpy")
+    except (TypeError, ValueError, ImportError):
+        return None
+
+
+ARROW_STRING = _arrow_string_dtype()
+
+
+def _is_text(s):
+    # 문자열(+ 빈값)만 있는 object 컬럼만 바꿈 (숫자가 섞인 컬럼은 그대로)
+    return s.dtype == object and pd.api.types.infer_dtype(s, skipna=True) in ("string", "empty")
+
+
+def small_int(s):
+    # 빈값이 없고 범위 안이면 int16 (연도/월), 아니면 그대로 둠
+    if pd.api.types.is_numeric_dtype(s) and s.notna().all() and s.between(-32768, 32767).all():
+        return s.astype("int16")
+    return s
+
+
+def apply_dtypes(df):
+    """dtype 정책 적용 (제자리 변경 없이 바뀐 컬럼만 새로 만듦)
+
+    값은 그대로 두고 저장 형식만 바꾸므로 머지 / 비교 / 내보내기 결과는 같다.
+    """
+    changes = {}
+
+    for col in df.columns.intersection(CATEGORY_COLUMNS):
+        s = df[col]
+        if _is_text(s) and s.nunique() <= max(1, len(s) * CATEGORY_MAX_RATIO):
+            changes[col] = s.astype("category")
+
+    if ARROW_STRING is not None:
+        for col in df.columns.intersection(STRING_COLUMNS):
+            if _is_text(df[col]):
+                changes[col] = df[col].astype(ARROW_STRING)
+
+    for col in df.columns.intersection(SMALL_INT_COLUMNS):
+        s = df[col]
+        if s.dtype != "int16" and small_int(s) is not s:
+            changes[col] = small_int(s)
+
+    return df.assign(**changes) if changes else df
@@ -1,28 +1,302 @@
+import importlib.util
 import io
+import re
+import tempfile
+import zipfile
+from pathlib import Path
+from xml.etree import ElementTree
+
 import pandas as pd
+import xlsxwriter
 
-def to_excel_with_format(df, highlight_after_col=None):
-    output = io.BytesIO()
+from utils.dtypes import apply_dtypes
+
+
+# python-calamine 이 설치돼 있고 pandas 2.2+ 이면 훨씬 빠른 calamine 엔진 사용
+# 없으면 openpyxl (pandas 가 read_only 모드로 행 단위로 읽음)
+_PANDAS_VERSION = tuple(int(v) for v in re.findall(r"\d+", pd.__version__)[:2])
+EXCEL_ENGINE = (
+    "calamine"
+    if importlib.util.find_spec("python_calamine") and _PANDAS_VERSION >= (2, 2)
+    else "openpyxl"
+)
+
+_XLSX_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_REL_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def select_columns(header, last_column=None, required_columns=None):
+    # 읽을 컬럼 위치: last_column 까지 전부, 아니면 required_columns 만
+    header = list(header)
+    if last_column and last_column in header:
+        return list(range(header.index(last_column) + 1))
+    if required_columns:
+        return [i for i, col in enumerate(header) if col in required_columns]
+    return None
+
+
+def _column_index(ref):
+    # 'C1' → 2
+    index = 0
+    for ch in ref:
+        if not ch.isalpha():
+            break
+        index = index * 26 + ord(ch.upper()) - 64
+    return index - 1
+
+
+def _cell_value(cell):
+    kind = cell.get("t")
+    if kind == "inlineStr":
+        return "".join(node.text or "" for node in cell.iter(f"{_XLSX_NS}t"))
+    value = cell.findtext(f"{_XLSX_NS}v")
+    if value is None or kind in ("s", "str", "e"):
+        return value
+    if kind == "b":
+        return value == "1"
+    number = float(value)
+    return int(number) if number.is_integer() else number
+
+
+def _shared_strings(archive, wanted):
+    # sharedStrings.xml 에서 필요한 번호까지만 읽음 (헤더는 보통 앞쪽)
+    strings = {}
+    if not wanted or "xl/sharedStrings.xml" not in archive.namelist():
+        return strings
+
+    last = max(wanted)
+    with archive.open("xl/sharedStrings.xml") as f:
+        number = 0
+        for _, node in ElementTree.iterparse(f):
+            if node.tag != f"{_XLSX_NS}si":
+                continue
+            if number in wanted:
+                # 일반 <t>, 서식 있는 <r><t> (읽는 법 표기 <rPh> 는 뺌)
+                parts = [node.findtext(f"{_XLSX_NS}t") or ""]
+                parts += [run.findtext(f"{_XLSX_NS}t") or "" for run in node.findall(f"{_XLSX_NS}r")]
+                strings[number] = "".join(parts)
+            if number >= last:
+                break
+            number += 1
+            node.clear()
+    return strings
+
+
+def read_header(file):
+    """xlsx 첫 시트의 첫 행(헤더)만 읽음
+
+    pd.read_excel(nrows=0) 은 시트 전체와 공유 문자열을 다 파싱하므로
+    zip 안의 시트 XML 을 첫 행까지만, 공유 문자열은 헤더가 쓰는 번호까지만 읽는다.
+    pandas 처럼 같은 이름이 또 나오면 '이름.1' 로 바꾼다.
+    헤더가 1행 A열에서 시작하지 않는 등 pandas 와 위치가 달라질 수 있으면 ValueError.
+    """
+    with zipfile.ZipFile(file) as archive:
+        workbook = ElementTree.fromstring(archive.read("xl/workbook.xml"))
+        rel_id = workbook.find(f"{_XLSX_NS}sheets/{_XLSX_NS}sheet").get(f"{_REL_NS}id")
+        rels = ElementTree.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+        target = next(rel.get("Target") for rel in rels if rel.get("Id") == rel_id)
+        path = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+
+        row = None
+        with archive.open(path) as f:
+            for _, node in ElementTree.iterparse(f):
+                if node.tag == f"{_XLSX_NS}row":
+                    row = node
+                    break
+
+        if row is None or row.get("r", "1") != "1":
+            raise ValueError("헤더가 1행에 없습니다")
+
+        cells = {}
+        for cell in row.findall(f"{_XLSX_NS}c"):
+            cells[_column_index(cell.get("r"))] = cell
+        if 0 not in cells:
+            raise ValueError("헤더가 A열에서 시작하지 않습니다")
+
+        values = {i: _cell_value(cell) for i, cell in cells.items()}
+        shared = _shared_strings(
+            archive, {int(values[i]) for i, cell in cells.items() if cell.get("t") == "s"}
+        )
+
+    header = []
+    seen = {}
+    for i in range(max(cells) + 1):
+        value = values.get(i)
+        if i in cells and cells[i].get("t") == "s":
+            value = shared[int(value)]
+        if value is None or value == "":
+            value = f"Unnamed: {i}"
+        if value in seen:
+            seen[value] += 1
+            value = f"{value}.{seen[value]}"
+        else:
+            seen[value] = 0
+        header.append(value)
+    return header
+
+
+def _header(file):
+    # 가볍게 헤더만 읽고, xlsx 구조가 예상과 다르면 pandas 로 읽음
+    try:
+        return read_header(file)
+    except (zipfile.BadZipFile, ElementTree.ParseError, KeyError, AttributeError, StopIteration, ValueError):
+        if hasattr(file, "seek"):
+            file.seek(0)
+        return pd.read_excel(file, nrows=0, engine=EXCEL_ENGINE).columns
+    finally:
+        if hasattr(file, "seek"):
+            file.seek(0)
+
+
+def _read_excel(file, last_column=None, required_columns=None):
+    usecols = None
+    if last_column or required_columns:
+        usecols = select_columns(_header(file), last_column, required_columns)
 
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Sheet1')
+    return pd.read_excel(file, usecols=usecols, engine=EXCEL_ENGINE)
 
-        workbook  = writer.book
-        worksheet = writer.sheets['Sheet1']
 
-        header_format = workbook.add_format({
+def read_excel(file, last_column=None, required_columns=None, cache=None):
+    """필요한 컬럼만 읽는 엑셀 로더
+
+    last_column / required_columns 가 없으면 전체 컬럼을 읽는다.
+    헤더를 먼저 읽어서 위치 기반 usecols 를 만들기 때문에
+    같은 이름의 컬럼이 있어도 원래 순서대로 잘린다.
+    cache(FrameCache)를 넘기면 같은 파일 + 같은 설정은 Parquet 캐시에서 바로 읽는다.
+    읽은 뒤 dtype 정책(utils.dtypes)을 적용한다.
+    """
+    if cache is None:
+        return apply_dtypes(_read_excel(file, last_column, required_columns))
+
+    data = file.getvalue() if hasattr(file, "getvalue") else Path(file).read_bytes()
+    key = cache.make_key(
+        data,
+        engine=EXCEL_ENGINE,
+        last_column=last_column,
+        required_columns=list(required_columns or []),
+    )
+
+    df = cache.get(key)
+    if df is None:
+        df = _read_excel(io.BytesIO(data), last_column, required_columns)
+        cache.put(key, df)
+    return apply_dtypes(df)
+
+
+# xlsx 한 시트 최대 행 수 (헤더 포함)
+EXCEL_MAX_ROWS = 1_048_576
+
+# 한 번에 파이썬 값으로 바꿔 쓰는 행 수
+WRITE_CHUNK_ROWS = 10_000
+
+
+def _sheet_formats(workbook):
+    return {
+        "base": workbook.add_format({"bold": True, "border": 1, "align": "center", "valign": "top"}),
+        "header": workbook.add_format({
             'bg_color': '#DDEBF7',
             'bold': True,
             'border': 1,
             'align': 'center'
-        })
+        }),
+        "datetime": workbook.add_format({"num_format": "yyyy-mm-dd hh:mm:ss"}),
+    }
+
+
+def _new_workbook(target):
+    return xlsxwriter.Workbook(target, {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd",
+        "remove_timezone": True,
+        # inf / -inf 는 엑셀에 없는 값이라 오류 셀(#DIV/0!)로 기록
+        "nan_inf_to_errors": True,
+    })
+
+
+def _write_sheet(workbook, formats, sheet_name, df, highlight_after_col=None):
+    worksheet = workbook.add_worksheet(sheet_name)
+
+    start_col = len(df.columns)
+    if highlight_after_col and highlight_after_col in df.columns:
+        start_col = df.columns.get_loc(highlight_after_col) + 1
+        if start_col < len(df.columns):
+            worksheet.set_column(start_col, len(df.columns) - 1, 15)
 
-        if highlight_after_col and highlight_after_col in df.columns:
-            start_col = df.columns.get_loc(highlight_after_col) + 1
-            for col_num in range(start_col, len(df.columns)):
-                col_name = df.columns[col_num]
-                worksheet.write(0, col_num, col_name, header_format)
-                worksheet.set_column(col_num, col_num, 15)
+    for col_num, col_name in enumerate(df.columns):
+        worksheet.write(0, col_num, col_name, formats["header"] if col_num >= start_col else formats["base"])
 
-    output.seek(0)
-    return output.getvalue()
+    # 시각이 있는 날짜만 날짜+시각 서식 (회계일자처럼 날짜뿐이면 기본 날짜 서식)
+    col_formats = []
+    for col_num in range(len(df.columns)):
+        s = df.iloc[:, col_num]
+        fmt = None
+        if pd.api.types.is_datetime64_any_dtype(s) and (s.dropna() != s.dropna().dt.normalize()).any():
+            fmt = formats["datetime"]
+        col_formats.append(fmt)
+
+    # WRITE_CHUNK_ROWS 행씩 잘라서 파이썬 값으로 바꿔 기록 (컬럼 전체를 한 번에 리스트로 만들지 않음)
+    for start in range(0, len(df), WRITE_CHUNK_ROWS):
+        chunk = df.iloc[start:start + WRITE_CHUNK_ROWS]
+        columns = [
+            (col_num, chunk.iloc[:, col_num].tolist(), chunk.iloc[:, col_num].isna().tolist(), fmt)
+            for col_num, fmt in enumerate(col_formats)
+        ]
+        for i in range(len(chunk)):
+            for col_num, values, nulls, fmt in columns:
+                if not nulls[i]:
+                    worksheet.write(start + i + 1, col_num, values[i], fmt)
+
+
+def sheet_names(names):
+    # 엑셀 시트 이름 규칙: 31자 이하, []:*?/\ 불가, 중복 불가 (대소문자 무시)
+    result = []
+    used = set()
+    for name in names:
+        base = re.sub(r"[\[\]:*?/\\]", "_", str(name))[:31] or "Sheet"
+        sheet, n = base, 1
+        while sheet.lower() in used:
+            n += 1
+            suffix = f"_{n}"
+            sheet = base[:31 - len(suffix)] + suffix
+        used.add(sheet.lower())
+        result.append(sheet)
+    return result
+
+
+def write_excel(df, target, highlight_after_col=None):
+    """DataFrame 을 xlsx 로 한 행씩 기록 (xlsxwriter constant_memory 모드)
+
+    target 은 파일 경로나 파일 객체.
+    시트 전체를 메모리에 올리지 않고 행 순서대로 바로 써 나간다.
+    헤더 서식은 pandas.to_excel 과 같고,
+    highlight_after_col 다음 컬럼부터 헤더를 강조하고 너비 15 로 맞춘다.
+    빈값(NaN/NaT/None)은 빈 셀, inf 는 오류 셀로 둔다. 날짜는 yyyy-mm-dd (시각이 있으면 시각까지).
+    """
+    write_workbook({"Sheet1": (df, highlight_after_col)}, target)
+
+
+def write_workbook(sheets, target):
+    """여러 결과를 시트별로 한 통합 문서에 기록
+
+    sheets: {시트 이름: (df, highlight_after_col)}
+    시트 이름은 엑셀 규칙에 맞게 고쳐서 쓴다. 행 수 초과는 쓰기 전에 ValueError.
+    """
+    for name, (df, _) in sheets.items():
+        if len(df) + 1 > EXCEL_MAX_ROWS:
+            raise ValueError(
+                f"엑셀 한 시트에 담을 수 없는 행 수입니다: {name} {len(df):,}행 (최대 {EXCEL_MAX_ROWS - 1:,}행)"
+            )
+
+    workbook = _new_workbook(target)
+    formats = _sheet_formats(workbook)
+    for sheet_name, (df, highlight_after_col) in zip(sheet_names(sheets), sheets.values()):
+        _write_sheet(workbook, formats, sheet_name, df, highlight_after_col)
+    workbook.close()
+
+
+def to_excel_with_format(df, highlight_after_col=None):
+    # 작업용 임시 파일에 기록한 뒤 바이트로 돌려줌 (st.download_button 용)
+    with tempfile.TemporaryFile() as output:
+        write_excel(df, output, highlight_after_col=highlight_after_col)
+        output.seek(0)
+        return output.read()
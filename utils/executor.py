@@ -0,0 +1,149 @@
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import nullcontext
+
+from utils.incremental import IncrementalRunner
+from utils.profiling import StageTimer, log_profile
+
+
+# 워커 프로세스마다 한 번만 받아 두는 기준 인덱스 (작업마다 pickle 하지 않음)
+_worker_index = None
+_worker_runner = None
+_worker_profile = False
+
+
+def _init_worker(index, incremental=False, profile=False):
+    global _worker_index, _worker_runner, _worker_profile
+    _worker_index = index
+    _worker_runner = IncrementalRunner() if incremental else None
+    _worker_profile = profile
+
+
+def _run_task(task):
+    processor, df = task
+    timer = StageTimer(memory=_worker_profile, profile=_worker_profile)
+    try:
+        if _worker_runner is not None:
+            result = _worker_runner.run(processor, df, None, _worker_index, timer)
+        else:
+            result = processor.preprocess(df, None, index=_worker_index, timer=timer)
+    except Exception as e:
+        return None, f"처리 중 오류: {e}"
+
+    # 단계별 측정 결과는 df.attrs 로 같이 돌려줌
+    result.attrs["프로파일"] = timer.summary(processor.name)
+    return result, None
+
+
+def run_preprocessors(tasks, index, max_workers=None, incremental=False, profile=False):
+    """[(processor, df), ...] 를 프로세스 풀에서 실행
+
+    결과는 입력 순서대로 [(result_df, error), ...] 로 돌려준다.
+    기준 인덱스는 워커 초기화 때 한 번만 넘기고, 작업에는 원장 df 만 실린다.
+    파일이 하나뿐이거나 max_workers=1 이면 현재 프로세스에서 바로 실행한다.
+    incremental=True 면 월별로 저장된 결과를 재사용한다 (IncrementalRunner).
+    단계별 시간은 항상 result_df.attrs["프로파일"] 에 남고,
+    profile=True 면 메모리 측정과 가장 느린 단계의 cProfile 도 같이 남긴다.
+    """
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(tasks))
+
+    if max_workers <= 1:
+        _init_worker(index, incremental, profile)
+        return [_run_task(task) for task in tasks]
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_worker,
+        initargs=(index, incremental, profile)
+    ) as pool:
+        return list(pool.map(_run_task, tasks))
+
+
+# 화면(JobManager)에서 쓰는 프로세스 풀: 기준 인덱스 + 옵션 조합별로 최근 것만 유지
+WORKER_PROCESSES = int(os.environ.get("CAR_ABC_WORKERS", str(os.cpu_count() or 1)))
+POOL_KEEP = 2
+
+_pools = OrderedDict()
+_pools_lock = threading.Lock()
+
+
+def worker_pool(index, incremental=False, profile=False):
+    """서버 프로세스에서 계속 쓰는 전처리용 프로세스 풀
+
+    run_preprocessors 와 같이 기준 인덱스는 워커 초기화 때 한 번만 넘긴다.
+    기준 인덱스 / 옵션이 바뀌면 새 풀을 만들고, 최근 POOL_KEEP 개보다 오래된 풀은
+    진행 중인 작업이 끝나는 대로 닫는다.
+    """
+    key = (index.fingerprint or id(index), incremental, profile)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = _pools[key] = ProcessPoolExecutor(
+                max_workers=WORKER_PROCESSES,
+                initializer=_init_worker,
+                initargs=(index, incremental, profile)
+            )
+        _pools.move_to_end(key)
+        while len(_pools) > POOL_KEEP:
+            _, old = _pools.popitem(last=False)
+            old.shutdown(wait=False)
+        return pool
+
+
+def _discard_pool(pool):
+    # 워커가 죽은(메모리 부족 등) 풀은 버림 → 다음 작업 때 새로 만듦
+    with _pools_lock:
+        for key, value in list(_pools.items()):
+            if value is pool:
+                del _pools[key]
+    pool.shutdown(wait=False)
+
+
+# tracemalloc 은 프로세스 전체에 하나라 메모리를 재는 읽기는 한 번에 하나씩
+_profile_lock = threading.Lock()
+
+
+def process_file(job, processor, data, index, load, incremental=False, profile=False, file_name=""):
+    """업로드 파일 하나 읽기 + 전처리 (JobManager 백그라운드 작업용)
+
+    load(file, last_column, required_columns) 로 읽고 구조를 확인하는 것까지는 작업 스레드에서,
+    전처리는 worker_pool 의 워커 프로세스에서 실행한다 (파일이 여러 개면 여러 코어로 나뉨).
+    진행률은 읽기 → 전처리 → 끝 순서로 job 에 남긴다 (워커 안의 단계별 진행률은 받지 않음).
+    반환값은 run_preprocessors 와 같은 (result_df, error) 이고,
+    읽기를 포함한 단계별 측정은 result_df.attrs["프로파일"] 과 프로파일 로그에 남긴다.
+    """
+    timer = StageTimer(memory=profile)
+
+    job.report(0.0, "load")
+    with _profile_lock if profile else nullcontext():
+        df = timer.run("load", load, io.BytesIO(data), processor.last_column, processor.required_columns)
+    if not processor.validate(df):
+        return None, "❌ 엑셀 구조가 맞지 않습니다"
+
+    job.report(0.2, "전처리")
+    pool = worker_pool(index, incremental, profile)
+    try:
+        result, error = pool.submit(_run_task, (processor, df)).result()
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+    if error:
+        return None, error
+
+    # 워커의 단계별 측정 앞에 읽기 단계를 붙임
+    load_stage = timer.summary()["stages"]
+    summary = result.attrs["프로파일"]
+    summary = {
+        **summary,
+        "stages": load_stage + summary["stages"],
+        "total": round(summary["total"] + load_stage[0]["seconds"], 4),
+    }
+    result.attrs["프로파일"] = summary
+    log_profile(summary, file=file_name)
+    return result, None
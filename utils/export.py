@@ -0,0 +1,96 @@
+import io
+import tempfile
+import time
+import zipfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.excel import write_excel, write_workbook
+
+
+# 형식별 확장자 / MIME
+EXPORT_FORMATS = {
+    "xlsx": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "csv": ("csv", "text/csv"),
+    "parquet": ("parquet", "application/vnd.apache.parquet"),
+}
+
+
+def _arrow_table(df):
+    # 타입이 섞인 object 컬럼(숫자 + 문자열 등)은 문자열로 맞춰서 저장
+    columns = {}
+    for col in df.columns:
+        s = df[col]
+        if s.dtype == object:
+            try:
+                pa.array(s, from_pandas=True)
+            except (pa.ArrowInvalid, pa.ArrowTypeError):
+                s = s.where(s.isna(), s.astype(str))
+        columns[str(col)] = s.reset_index(drop=True)
+    return pa.Table.from_pandas(pd.DataFrame(columns), preserve_index=False)
+
+
+def write_output(df, target, fmt, highlight_after_col=None):
+    """결과 하나를 지정한 형식으로 기록 (target: 경로나 바이너리 파일 객체)
+
+    csv 는 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 을 붙인다.
+    """
+    if fmt == "xlsx":
+        write_excel(df, target, highlight_after_col=highlight_after_col)
+    elif fmt == "csv":
+        if hasattr(target, "write"):
+            text = io.TextIOWrapper(target, encoding="utf-8-sig", newline="")
+            df.to_csv(text, index=False)
+            text.detach()
+        else:
+            df.to_csv(target, index=False, encoding="utf-8-sig")
+    elif fmt == "parquet":
+        pq.write_table(_arrow_table(df), target)
+    else:
+        raise ValueError(f"지원하지 않는 형식입니다: {fmt}")
+
+
+def _to_bytes(write):
+    with tempfile.TemporaryFile() as output:
+        write(output)
+        output.seek(0)
+        return output.read()
+
+
+def output_bytes(df, fmt, highlight_after_col=None):
+    # st.download_button 용
+    return _to_bytes(lambda target: write_output(df, target, fmt, highlight_after_col))
+
+
+def workbook_bytes(outputs):
+    """outputs: {이름: (df, highlight_after_col)} → 결과별 시트가 있는 통합 xlsx"""
+    return _to_bytes(lambda target: write_workbook(outputs, target))
+
+
+def write_bundle(outputs, target, fmt="parquet", workbook=True):
+    """모든 결과를 zip 하나로 묶음
+
+    결과마다 '{이름}.{확장자}' 를 zip 항목에 바로 써 나가고 (중간 바이트 없이 한 번에),
+    workbook=True 면 시트별 통합 xlsx 도 함께 넣는다.
+    """
+    ext, _ = EXPORT_FORMATS[fmt]
+
+    def member(name):
+        info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_DEFLATED
+        return zf.open(info, "w", force_zip64=True)
+
+    with zipfile.ZipFile(target, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for name, (df, highlight_after_col) in outputs.items():
+            with member(f"{name}.{ext}") as entry:
+                write_output(df, entry, fmt, highlight_after_col)
+
+        if workbook:
+            with member("통합.xlsx") as entry:
+                write_workbook(outputs, entry)
+
+
+def bundle_bytes(outputs, fmt="parquet", workbook=True):
+    return _to_bytes(lambda target: write_bundle(outputs, target, fmt, workbook))
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+
+from utils.plate import REGIONS, normalize_plate
+
+
+# 정확히 매칭되지 않은 행에 붙이는 후보 컬럼
+SUGGEST_COLUMNS = ['후보상품ID', '후보차량번호', '후보신뢰도']
+
+# 편집 거리별 신뢰도 (0: 지역명 / 공백만 다름, 1: 한 글자 오타 / 누락 / 추가)
+# 같은 거리의 후보가 여러 대면 후보 수로 나눔
+CONFIDENCE = {0: 0.9, 1: 0.7}
+
+_REGION_PREFIX = rf'^(?:{"|".join(REGIONS)})'
+
+
+def core_plate(s):
+    # 공백과 앞의 지역명을 뺀 차량번호 (예: '서울 12가3456' → '12가3456')
+    s = normalize_plate(s)
+    return s.where(s.isna(), s.astype(str).str.replace(_REGION_PREFIX, '', regex=True))
+
+
+def _bucket(frame):
+    # (연도, 월, 지운 문자열) → 한 문자열 키
+    month = frame['_연도'].astype('int64') * 100 + frame['_월'].astype('int64')
+    return month.astype(str) + '|' + frame['_키']
+
+
+def _deletions(frame):
+    """차량번호마다 원래 문자열(_위치 -1) + 한 글자씩 지운 문자열(_위치 i) 을 _키 로 펼침
+
+    두 차량번호의 편집 거리가 1 이하이면 펼친 _키 중 하나가 반드시 같다 (symmetric delete).
+    """
+    plate = frame['_차량번호']
+    parts = [frame.assign(_키=plate, _위치=-1)]
+
+    lengths = plate.str.len()
+    for i in range(int(lengths.max()) if len(plate) else 0):
+        ok = (lengths > i).to_numpy()
+        s = plate[ok]
+        parts.append(frame[ok].assign(_키=s.str[:i] + s.str[i + 1:], _위치=i))
+
+    return pd.concat(parts, ignore_index=True)
+
+
+class FuzzyPlateIndex:
+    """기준 데이터 차량번호의 유사 검색 인덱스
+
+    (판매연도, 판매월) 안에서 지역명을 뺀 차량번호를 한 글자씩 지운 키로 미리 펼쳐 버킷으로 묶어 둔다.
+    suggest 는 상품ID 를 못 찾은 행만 같은 방식으로 펼쳐 버킷을 한 번에 찾으므로
+    기준 차량번호 수와 상관없이 빠르고, 정확 매칭(VehicleIndex.match)에는 영향이 없다.
+    """
+
+    def __init__(self, base_df, plate_columns):
+        frames = []
+        for order, col in enumerate(plate_columns):
+            frames.append(pd.DataFrame({
+                '_연도': base_df['판매연도'],
+                '_월': base_df['판매월'],
+                '_차량번호': core_plate(base_df[col]),
+                '후보차량번호': base_df[col],
+                '후보상품ID': base_df['상품ID'],
+                '_기준순서': np.arange(len(base_df)) + order * len(base_df),
+            }).dropna(subset=['_연도', '_월', '_차량번호']))   # 판매일자가 빈 차량은 버킷을 못 정하므로 뺌
+
+        base = pd.concat(frames, ignore_index=True).drop_duplicates(['_연도', '_월', '_차량번호', '후보상품ID'])
+        keys = _deletions(base).drop_duplicates(['_연도', '_월', '_키', '_위치', '후보상품ID'])
+
+        # 키별 버킷: 키 → 버킷 번호(Index, 해시 테이블은 처음 찾을 때 한 번만 만듦) + 버킷 시작 위치 / 개수
+        codes, uniques = pd.factorize(_bucket(keys))
+        order = np.argsort(codes, kind='stable')
+        # (Arrow 문자열이면 찾을 때마다 변환하므로 object 로 들고 있음)
+        self.buckets = pd.Index(np.asarray(uniques, dtype=object))
+        self.counts = np.bincount(codes, minlength=len(uniques))
+        self.starts = np.concatenate([[0], np.cumsum(self.counts)[:-1]])
+        self.entries = {
+            col: keys[col].to_numpy(dtype=object if col.startswith('후보') else None)[order]
+            for col in ['_위치', '후보상품ID', '후보차량번호', '_기준순서']
+        }
+
+    def _lookup(self, query):
+        # 펼친 질의 키 → 같은 버킷의 기준 항목과 짝 (질의 열 + 기준 열)
+        bucket = self.buckets.get_indexer(_bucket(query).to_numpy(dtype=object))
+        found = bucket >= 0
+        query, bucket = query[found], bucket[found]
+
+        counts = self.counts[bucket]
+        rows = np.repeat(np.arange(len(query)), counts)
+        offsets = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        positions = np.repeat(self.starts[bucket], counts) + offsets
+
+        pairs = query.iloc[rows].reset_index(drop=True)
+        for col, values in self.entries.items():
+            pairs[col if col != '_위치' else '_위치_기준'] = values[positions]
+        return pairs
+
+    def suggest(self, df, plate_cols, todo, year_col='회계연도', month_col='회계월'):
+        """todo 행의 (후보상품ID, 후보차량번호, 후보신뢰도)
+
+        plate_cols 를 모두 찾아 편집 거리가 가장 작은 후보를 고르고
+        (같으면 앞의 plate_col, 기준 데이터 순서), 같은 거리의 후보 수로 신뢰도를 나눈다.
+        """
+        result = pd.DataFrame(index=df.index, columns=SUGGEST_COLUMNS)
+        result['후보신뢰도'] = np.nan
+
+        queries = []
+        for order, col in enumerate(plate_cols):
+            rows = todo & df[col].notna() & df[year_col].notna() & df[month_col].notna()
+            queries.append(pd.DataFrame({
+                '_행': df.index[rows],
+                '_열': order,
+                '_연도': df.loc[rows, year_col].to_numpy(),
+                '_월': df.loc[rows, month_col].to_numpy(),
+                '_차량번호': core_plate(df.loc[rows, col]).to_numpy(),
+            }))
+        query = pd.concat(queries, ignore_index=True)
+        if query.empty:
+            return result
+
+        pairs = self._lookup(_deletions(query))
+
+        # 편집 거리: 둘 다 원래 문자열이면 0, 한쪽만 지웠거나 같은 위치를 지웠으면 1 (그 외는 2 이상)
+        original, original_base = pairs['_위치'] == -1, pairs['_위치_기준'] == -1
+        pairs['_거리'] = np.select(
+            [original & original_base, original | original_base | (pairs['_위치'] == pairs['_위치_기준'])],
+            [0, 1],
+            2,
+        )
+        pairs = pairs[pairs['_거리'] <= 1]
+        if pairs.empty:
+            return result
+
+        # 행마다 가장 가까운 거리의 후보만 남기고 후보 상품ID 수를 셈
+        pairs = pairs.sort_values(['_행', '_거리', '_열', '_기준순서'])
+        best = pairs.groupby('_행', sort=False)['_거리'].transform('min')
+        pairs = pairs[pairs['_거리'] == best].drop_duplicates(['_행', '후보상품ID'])
+
+        counts = pairs.groupby('_행', sort=False).size()
+        first = pairs.drop_duplicates('_행').set_index('_행')
+        confidence = first['_거리'].map(CONFIDENCE) / counts.reindex(first.index)
+
+        result.loc[first.index, '후보상품ID'] = first['후보상품ID'].to_numpy()
+        result.loc[first.index, '후보차량번호'] = first['후보차량번호'].to_numpy()
+        result.loc[first.index, '후보신뢰도'] = confidence.round(2).to_numpy()
+        return result
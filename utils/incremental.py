@@ -0,0 +1,85 @@
+import hashlib
+from functools import lru_cache
+from pathlib import Path
+
+import pandas as pd
+
+from utils.cache import CACHE_DIR, FrameCache
+
+
+PARTITION_DIR = CACHE_DIR / "partitions"
+
+_ROOT = Path(__file__).resolve().parent.parent
+
+
+@lru_cache(maxsize=1)
+def code_fingerprint():
+    # 전처리 코드나 규칙 파일이 바뀌면 저장된 월별 결과를 다시 쓰지 않도록 전체를 해시
+    h = hashlib.sha256()
+    paths = (
+        sorted((_ROOT / "versions").glob("*.py"))
+        + sorted((_ROOT / "utils").glob("*.py"))
+        + sorted((_ROOT / "config").rglob("*.json"))
+    )
+    for path in paths:
+        h.update(path.name.encode())
+        h.update(path.read_bytes())
+    return h.hexdigest()
+
+
+class IncrementalRunner:
+    """(회계연도, 회계월) 단위 증분 처리
+
+    원장을 월별로 나눠 각 월의 내용 해시를 만들고,
+    같은 해시의 결과가 저장돼 있으면 다시 쓰고 새로 생기거나 바뀐 월만 process 를 돌린다.
+    월을 합친 뒤 finalize(기간 전체 후처리)는 항상 다시 실행한다.
+    """
+
+    def __init__(self, cache=None):
+        self.cache = cache if cache is not None else FrameCache(PARTITION_DIR)
+
+    def partition_key(self, processor, part, index):
+        h = hashlib.sha256()
+        h.update(code_fingerprint().encode())
+        h.update(type(processor).__name__.encode())
+        h.update(index.fingerprint.encode())
+        h.update("\x00".join(map(str, part.columns)).encode())
+        h.update(pd.util.hash_pandas_object(part, index=True).to_numpy().tobytes())
+        return h.hexdigest()
+
+    def run(self, processor, df, base_df=None, index=None, timer=None):
+        # 기준 데이터 해시가 없으면 결과를 재사용할 근거가 없음 → 전체 처리
+        if index is None or index.fingerprint is None:
+            result = processor.preprocess(df, base_df, index, timer)
+            result.attrs["증분"] = {"재사용": 0, "처리": None}
+            return result
+
+        df = df[~df['회계일자'].isin(['월계', '누계'])]
+        dates = pd.to_datetime(df['회계일자'], errors='coerce')
+        months = dates.dt.year * 100 + dates.dt.month
+
+        parts = []
+        reused = processed = 0
+
+        for _, part in df.groupby(months, sort=True, dropna=False):
+            key = self.partition_key(processor, part, index)
+            out = self.cache.get(key)
+
+            if out is None:
+                out = processor.process(part, base_df, index, timer)
+                self.cache.put(key, out)
+                processed += 1
+            else:
+                reused += 1
+
+            parts.append(out)
+
+        if not parts:
+            return processor.preprocess(df, base_df, index, timer)
+
+        # 원래 행 순서로 되돌린 뒤 기간 전체 후처리
+        result = pd.concat(parts).sort_index(kind="stable")
+        result = timer.run("finalize", processor.finalize, result) if timer else processor.finalize(result)
+        result = processor.check_output(result)
+        result.attrs["증분"] = {"재사용": reused, "처리": processed}
+        return result
@@ -0,0 +1,107 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+JOB_WORKERS = int(os.environ.get("CAR_ABC_JOB_WORKERS", str(min(4, os.cpu_count() or 1))))
+JOB_KEEP = int(os.environ.get("CAR_ABC_JOB_KEEP", "16"))  # 끝난 작업은 최근 것만 남김
+JOB_POLL_SECONDS = 0.5  # 화면에서 진행 중인 작업을 다시 확인하는 간격
+
+
+class Job:
+    """백그라운드 작업 하나
+
+    state    : 대기 → 실행 → 완료 / 실패
+    progress : 0 ~ 1 (작업 함수가 report 로 갱신)
+    result   : 작업 함수의 반환값 (완료일 때, 받아 간 쪽이 release 하면 작업 목록에서 빠짐)
+    """
+
+    def __init__(self, key, label=""):
+        self.key = key
+        self.label = label
+        self.state = "대기"
+        self.progress = 0.0
+        self.step = ""
+        self.result = None
+        self.error = None
+        self.started = None
+        self.finished = None
+
+    @property
+    def done(self):
+        return self.state in ("완료", "실패")
+
+    @property
+    def seconds(self):
+        if self.started is None:
+            return 0.0
+        return (self.finished or time.time()) - self.started
+
+    def report(self, progress, step=""):
+        self.progress = min(max(progress, 0.0), 1.0)
+        self.step = step
+
+
+class JobManager:
+    """입력 해시로 찾는 백그라운드 작업 실행기 (서버 프로세스에 하나, 스레드 풀)
+
+    submit 은 같은 key 의 작업이 있으면 새로 돌리지 않고 그 작업을 돌려준다.
+    그래서 Streamlit 이 다시 실행돼도(위젯 조작 등) 진행 중이거나 끝난 작업을 그대로 이어 받는다.
+    실패한 작업은 돌려주지 않고 다시 돌린다 (일시적인 오류를 서버 재시작 없이 재시도).
+    결과를 받아 간 쪽은 release 로 작업을 목록에서 빼서, 결과를 메모리에 계속 잡아 두지 않는다.
+    작업 함수는 fn(job, *args) 형태로 불리며 job.report 로 진행률을 남길 수 있다.
+
+    스레드는 작업 순서 / 진행률 / 결과 보관만 맡는다. 무거운 전처리는 작업 함수가
+    프로세스 풀로 넘긴다 (utils.executor.process_file → worker_pool, 여러 코어 사용).
+    """
+
+    def __init__(self, max_workers=JOB_WORKERS, keep=JOB_KEEP):
+        self.keep = keep
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="car_abc_job")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(*parts):
+        return hashlib.sha256(json.dumps(parts, default=str).encode()).hexdigest()
+
+    def submit(self, key, fn, *args, label=""):
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.state == "실패":
+                job = self._jobs[key] = Job(key, label)
+                self._pool.submit(self._run, job, fn, args)
+                self._evict()
+            else:
+                self._jobs.move_to_end(key)
+            return job
+
+    def get(self, key):
+        return self._jobs.get(key)
+
+    def release(self, key):
+        # 결과를 넘겨받은 뒤 작업 목록에서 뺌 (결과는 받아 간 쪽만 들고 있음)
+        with self._lock:
+            self._jobs.pop(key, None)
+
+    def _run(self, job, fn, args):
+        job.state = "실행"
+        job.started = time.time()
+        try:
+            job.result = fn(job, *args)
+            job.progress = 1.0
+            job.state = "완료"
+        except Exception as e:
+            job.error = f"처리 중 오류: {e}"
+            job.state = "실패"
+        finally:
+            job.finished = time.time()
+
+    def _evict(self):
+        finished = [key for key, job in self._jobs.items() if job.done]
+        for key in finished[:max(0, len(finished) - self.keep)]:
+            del self._jobs[key]
@@ -0,0 +1,132 @@
+import pandas as pd
+
+from utils.fuzzy import FuzzyPlateIndex
+from utils.plate import normalize_plate
+
+
+BASE_PLATE_COLUMNS = ['신차량번호', '구차량번호']
+PRODUCT_COLUMNS = ['판매연도', '판매월', '판매처']
+
+
+class VehicleIndex:
+    """기준 데이터 차량 인덱스
+
+    기준 엑셀을 올릴 때 한 번만 만들고 모든 전처리기가 같이 쓴다.
+    - (판매연도, 판매월, 차량번호) → 상품ID  (신차량번호, 구차량번호 각각)
+    - 상품ID → (판매연도, 판매월, 판매처)
+    fuzzy=True 면 못 찾은 행의 후보를 찾는 유사 검색 인덱스(FuzzyPlateIndex)도 만든다.
+    nearest_days > 0 이면 못 찾은 행을 판매일자가 가장 가까운 차량(±일수 안)에 붙이는
+    match_nearest 용 (차량번호, 판매일자) 정렬 테이블도 만든다.
+    """
+
+    def __init__(self, base_df, fingerprint=None, fuzzy=False, nearest_days=0):
+        # 옵션에 따라 결과가 달라지므로 증분 처리 키(fingerprint)도 구분
+        options = (["fuzzy"] if fuzzy else []) + ([f"nearest{nearest_days}"] if nearest_days else [])
+        self.fingerprint = ":".join([fingerprint] + options) if fingerprint else fingerprint
+        self.fuzzy = FuzzyPlateIndex(base_df, BASE_PLATE_COLUMNS) if fuzzy else None
+        self.nearest_days = nearest_days
+
+        # 같은 키가 여러 건이면 기준 데이터 순서상 첫 번째 상품ID
+        self.plates = {}
+        for col in BASE_PLATE_COLUMNS:
+            lookup = pd.DataFrame({
+                '_연도': base_df['판매연도'],
+                '_월': base_df['판매월'],
+                '_차량번호': normalize_plate(base_df[col]),
+                '상품ID': base_df['상품ID'],
+            })
+            lookup = lookup.dropna(subset=['_차량번호'])
+            self.plates[col] = lookup.drop_duplicates(['_연도', '_월', '_차량번호'])
+
+        # 차량번호별 판매일자 (merge_asof 는 일자 순 정렬이 필요, 같은 날짜는 기준 데이터 순서상 첫 번째)
+        self.dated = {}
+        if nearest_days:
+            for col in BASE_PLATE_COLUMNS:
+                # merge_asof 의 by 키는 양쪽 dtype 이 같아야 해서 object 로 맞춤
+                dated = pd.DataFrame({
+                    '_차량번호': normalize_plate(base_df[col]).astype(object),
+                    '_일자': base_df['판매일자'].astype('datetime64[ns]'),
+                    '상품ID': base_df['상품ID'],
+                }).dropna(subset=['_차량번호', '_일자'])
+                dated = dated.drop_duplicates(['_차량번호', '_일자'])
+                self.dated[col] = dated.sort_values('_일자', kind='stable', ignore_index=True)
+
+        product_cols = [c for c in PRODUCT_COLUMNS if c in base_df.columns]
+        self.products = (
+            base_df[['상품ID'] + product_cols]
+            .drop_duplicates('상품ID')
+            .set_index('상품ID')
+        )
+
+    def match(self, df, plate_cols, year_col='회계연도', month_col='회계월'):
+        """(연도, 월, 차량번호) 키 조인으로 상품ID 매칭
+
+        신차량번호 → 구차량번호 순서로, 각 기준 컬럼 안에서는 plate_cols 순서대로 찾고
+        먼저 찾은 상품ID를 사용한다.
+        """
+        if isinstance(plate_cols, str):
+            plate_cols = [plate_cols]
+
+        result = pd.Series(None, index=df.index, dtype=object)
+
+        for base_col in BASE_PLATE_COLUMNS:
+            lookup = self.plates[base_col]
+
+            for plate_col in plate_cols:
+                todo = result.isna() & df[plate_col].notna()
+                if not todo.any():
+                    continue
+
+                keys = pd.DataFrame({
+                    '_연도': df.loc[todo, year_col],
+                    '_월': df.loc[todo, month_col],
+                    '_차량번호': normalize_plate(df.loc[todo, plate_col]),
+                })
+                matched = keys.merge(lookup, on=['_연도', '_월', '_차량번호'], how='left')
+                result.loc[todo] = matched['상품ID'].to_numpy()
+
+        return result
+
+    def product_info(self, product_ids, columns=None):
+        # 상품ID별 판매 정보 (입력 순서, 인덱스 유지)
+        info = self.products if columns is None else self.products[columns]
+        info = info.reindex(product_ids.to_numpy())
+        info.index = product_ids.index
+        return info
+
+    def match_nearest(self, df, plate_cols, todo, date_col='회계일자'):
+        """todo 행을 차량번호가 같고 판매일자가 가장 가까운 상품ID 에 매칭 (±nearest_days 일 안)
+
+        월 단위 키 조인(match)으로 못 찾은 월말 / 월초 전표용.
+        행마다 따로 찾지 않고 기준 컬럼 x plate_col 마다 merge_asof 한 번으로 처리하며
+        찾는 순서는 match 와 같다 (신차량번호 → 구차량번호, 그 안에서 plate_cols 순서).
+        """
+        if isinstance(plate_cols, str):
+            plate_cols = [plate_cols]
+
+        result = pd.Series(None, index=df.index, dtype=object)
+        if not self.nearest_days:
+            return result
+
+        tolerance = pd.Timedelta(days=self.nearest_days)
+        for base_col in BASE_PLATE_COLUMNS:
+            dated = self.dated[base_col]
+
+            for plate_col in plate_cols:
+                rows = todo & result.isna() & df[plate_col].notna() & df[date_col].notna()
+                if not rows.any():
+                    continue
+
+                keys = pd.DataFrame({
+                    '_행': df.index[rows],
+                    '_차량번호': normalize_plate(df.loc[rows, plate_col]).to_numpy(dtype=object),
+                    '_일자': df.loc[rows, date_col].astype('datetime64[ns]').to_numpy(),
+                }).sort_values('_일자', kind='stable')
+
+                matched = pd.merge_asof(
+                    keys, dated, on='_일자', by='_차량번호',
+                    direction='nearest', tolerance=tolerance
+                ).dropna(subset=['상품ID'])
+                result.loc[matched['_행'].to_numpy()] = matched['상품ID'].to_numpy()
+
+        return result
@@ -0,0 +1,80 @@
+import pandas as pd
+
+from utils.dtypes import apply_dtypes
+
+
+BASE_REQUIRED_COLUMNS = ["상품ID", "판매일자"]
+
+
+def prepare_base(base_df):
+    # 필수 컬럼 방어
+    missing = set(BASE_REQUIRED_COLUMNS) - set(base_df.columns)
+    if missing:
+        raise ValueError(f"기준 데이터에 필수 컬럼이 없습니다: {missing}")
+
+    base_df["판매일자"] = pd.to_datetime(base_df["판매일자"])
+    base_df["판매연도"] = base_df["판매일자"].dt.year
+    base_df["판매월"] = base_df["판매일자"].dt.month
+    return apply_dtypes(base_df)
+
+
+# 상품ID 당 여러 행이면 더하는 금액 컬럼 (나머지는 첫 행 값)
+AMOUNT_COLUMNS = ["차변", "대변"]
+
+
+def aggregate_result(name, df, key, exclude=()):
+    """결과 하나를 key 당 한 행으로 묶고 컬럼명 앞에 결과 이름을 붙임"""
+    df = df[df[key].notna()]
+    columns = [c for c in df.columns if c != key and c not in exclude]
+
+    agg = {c: "sum" if c in AMOUNT_COLUMNS else "first" for c in columns}
+    grouped = df.groupby(key, sort=False)
+    out = grouped.agg(agg) if agg else pd.DataFrame(index=grouped.size().index)
+    out["건수"] = grouped.size()
+
+    return out.add_prefix(f"{name}_")
+
+
+def fanout_report(name, df, key):
+    # 그대로 merge 했다면 행이 얼마나 늘어났을지
+    counts = df[key].dropna().value_counts()
+    return {
+        "결과": name,
+        "행수": len(df),
+        "키": len(counts),
+        "중복키": int((counts > 1).sum()),
+        "최대중복": int(counts.max()) if len(counts) else 0,
+        "늘어날행": int((counts[counts > 1] - 1).sum()),
+    }
+
+
+def final_merge(base_df, results):
+    """기준 데이터에 모든 결과를 한 번에 붙임
+
+    results: {이름: {"df": 결과, "merge_key": 키}}
+    결과마다 key 당 한 행으로 미리 묶고(금액은 합계, 나머지는 첫 값)
+    이름을 앞에 붙인 뒤 한 번의 join 으로 붙이므로 행 수는 기준 데이터와 같다.
+    중복 키 때문에 예전 방식이라면 늘어났을 행 수는 report 로 돌려준다.
+    """
+    report = []
+    by_key = {}
+
+    for name, item in results.items():
+        key = item["merge_key"]
+        if not key:
+            continue
+
+        report.append(fanout_report(name, item["df"], key))
+        by_key.setdefault(key, []).append(
+            aggregate_result(name, item["df"], key, exclude=base_df.columns)
+        )
+
+    final_df = base_df
+    for key, parts in by_key.items():
+        wide = pd.concat(parts, axis=1)
+        final_df = final_df.merge(wide, left_on=key, right_index=True, how="left")
+
+    if final_df is base_df:
+        final_df = base_df.copy()
+
+    return final_df, report
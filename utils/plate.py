@@ -0,0 +1,48 @@
+import re
+
+import pandas as pd
+
+
+REGIONS = ['서울', '부산', '대구', '인천', '광주', '대전', '울산', '경기']
+
+
+def normalize_plate(s):
+    # 공백 제거 (예: '12가 3456' → '12가3456')
+    return s.where(s.isna(), s.astype(str).str.replace(r'\s+', '', regex=True))
+
+
+def unit_pattern(allow_space=False):
+    space = r'\s?' if allow_space else ''
+    return (
+        r'(?:'
+        rf'(?:{"|".join(REGIONS)})?\d{{2,3}}[가-힣]{space}\d{{4}}'
+        r'|지게차)'
+    )
+
+
+class PlateExtractor:
+    """적요에서 차량번호 추출 (패턴은 한 번만 컴파일)
+
+    컬럼마다 패턴 하나로 첫 번째 매칭을 찾는다 (요청한 컬럼만 계산).
+    - 차량번호 : 처음 나오는 차량번호
+    - 차량번호1: '(' 앞의 차량번호
+    - 차량번호2: '(' 뒤의 차량번호
+    allow_space=True 면 '12가 3456' 형태도 찾고 공백은 제거해서 돌려준다.
+    """
+
+    def __init__(self, allow_space=False):
+        self.allow_space = allow_space
+        unit = unit_pattern(allow_space)
+
+        self.patterns = {
+            '차량번호': re.compile(rf'({unit})'),
+            '차량번호1': re.compile(rf'({unit})\('),
+            '차량번호2': re.compile(rf'\(({unit})'),
+        }
+
+    def extract(self, s, columns=('차량번호',)):
+        plates = pd.DataFrame(index=s.index)
+        for col in columns:
+            found = s.str.extract(self.patterns[col], expand=False)
+            plates[col] = normalize_plate(found) if self.allow_space else found
+        return plates
@@ -0,0 +1,135 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import time
+import tracemalloc
+import uuid
+from datetime import datetime
+
+import pandas as pd
+
+from utils.cache import CACHE_DIR
+
+
+PROFILE_DIR = CACHE_DIR / "profiles"
+PROFILE_LOG = PROFILE_DIR / "runs.jsonl"
+PROFILE_KEEP = 50  # .prof 파일은 최근 것만 남김
+
+logger = logging.getLogger("car_abc.profile")
+
+
+class StageTimer:
+    """전처리 단계별 측정
+
+    run(이름, 함수, df, ...) 로 단계를 실행하면서 아래 값을 단계 이름별로 누적한다.
+    (증분 처리처럼 같은 단계가 월마다 여러 번 불려도 한 줄로 합쳐짐)
+    - seconds / calls / rows_in / rows_out
+    - match_rate : 결과에 상품ID 가 있으면 채워진 비율
+    - peak_mb    : memory=True 일 때 단계 중 새로 잡은 메모리 최대치 (tracemalloc, 느려짐)
+    profile=True 면 단계마다 cProfile 을 켜고, 가장 느린 단계의 통계만 파일로 남긴다.
+    """
+
+    def __init__(self, memory=False, profile=False):
+        self.memory = memory
+        self.profile = profile
+        self.stages = {}
+        self.profilers = {}
+
+    def run(self, name, fn, *args):
+        df_in = args[0] if args and isinstance(args[0], pd.DataFrame) else None
+
+        tracing = self.memory and not tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.start()
+        if self.memory:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+
+        profiler = self.profilers.setdefault(name, cProfile.Profile()) if self.profile else None
+        if profiler:
+            profiler.enable()
+
+        started = time.perf_counter()
+        try:
+            out = fn(*args)
+        finally:
+            elapsed = time.perf_counter() - started
+            if profiler:
+                profiler.disable()
+            peak = tracemalloc.get_traced_memory()[1] - before if self.memory else None
+            if tracing:
+                tracemalloc.stop()
+
+        rec = self.stages.setdefault(name, {
+            "stage": name, "seconds": 0.0, "calls": 0, "rows_in": 0, "rows_out": 0
+        })
+        rec["seconds"] += elapsed
+        rec["calls"] += 1
+        if df_in is not None:
+            rec["rows_in"] += len(df_in)
+        if isinstance(out, pd.DataFrame):
+            rec["rows_out"] += len(out)
+            if "상품ID" in out.columns:
+                rec["matched"] = rec.get("matched", 0) + int(out["상품ID"].notna().sum())
+                rec["match_rate"] = round(rec["matched"] / rec["rows_out"], 4) if rec["rows_out"] else None
+        if peak is not None:
+            rec["peak_mb"] = round(max(rec.get("peak_mb", 0), peak / 2 ** 20), 1)
+
+        return out
+
+    def slowest(self):
+        if not self.stages:
+            return None
+        return max(self.stages.values(), key=lambda r: r["seconds"])["stage"]
+
+    def dump_profile(self):
+        # 가장 느린 단계의 cProfile 통계 → .prof 파일 + 상위 함수 요약
+        stage = self.slowest()
+        if stage not in self.profilers:
+            return None
+
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        path = PROFILE_DIR / f"{datetime.now():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}.prof"
+        self.profilers[stage].dump_stats(path)
+        for old in sorted(PROFILE_DIR.glob("*.prof"))[:-PROFILE_KEEP]:
+            old.unlink(missing_ok=True)
+
+        text = io.StringIO()
+        pstats.Stats(str(path), stream=text).sort_stats("cumulative").print_stats(20)
+        return {"stage": stage, "path": str(path), "top": text.getvalue()}
+
+    def summary(self, label=""):
+        stages = [
+            {k: (round(v, 4) if k == "seconds" else v) for k, v in rec.items() if k != "matched"}
+            for rec in self.stages.values()
+        ]
+        result = {
+            "label": label,
+            "stages": stages,
+            "total": round(sum(r["seconds"] for r in self.stages.values()), 4),
+            "slowest": self.slowest(),
+        }
+        if self.profile:
+            result["profile"] = self.dump_profile()
+        return result
+
+
+def log_profile(record, **extra):
+    """단계별 측정 결과를 로그 + JSON Lines 파일(PROFILE_LOG)로 남김"""
+    record = {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        **extra,
+        **{k: v for k, v in record.items() if k != "profile"},
+        "profile": (record.get("profile") or {}).get("path"),
+    }
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    logger.info(line)
+
+    try:
+        PROFILE_DIR.mkdir(parents=True, exist_ok=True)
+        with open(PROFILE_LOG, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        logger.warning("프로파일 기록 실패: %s", e)
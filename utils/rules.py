@@ -0,0 +1,186 @@
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+
+RULES_DIR = Path(__file__).resolve().parent.parent / "config" / "rules"
+
+TEXT_COLUMN = "적요"
+
+
+_END = ""  # 트라이에서 키워드가 끝나는 자리
+
+
+def _trie_pattern(node):
+    # 트라이 → 정규식 (자식을 먼저 시도하므로 한 위치에서 가장 긴 키워드가 잡힘)
+    branches = [re.escape(ch) + _trie_pattern(child) for ch, child in sorted(node.items()) if ch != _END]
+    if not branches:
+        return ""
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if _END in node:
+        body = f"(?:{body})?"
+    return body
+
+
+class KeywordScanner:
+    """글자 그대로의 키워드 여러 개를 한 번에 찾는 스캐너
+
+    keywords: {키워드: 규칙 번호}
+    모든 키워드를 트라이 모양 정규식 하나로 합쳐 문자열을 앞에서부터 한 번만 훑는다.
+    찾은 자리 바로 다음 글자부터 다시 찾으므로 겹치는 키워드도 놓치지 않고,
+    한 위치에서는 가장 긴 키워드가 잡히므로 각 키워드의 번호를
+    (자신 + 자신의 앞부분인 키워드) 중 가장 작은 번호로 미리 바꿔 둔다.
+    규칙 수가 늘어도 문자열을 훑는 횟수는 그대로다.
+    """
+
+    def __init__(self, keywords):
+        trie = {}
+        for keyword in keywords:
+            node = trie
+            for ch in keyword:
+                node = node.setdefault(ch, {})
+            node[_END] = True
+
+        self.pattern = re.compile(_trie_pattern(trie))
+        self.rank = {
+            keyword: min(n for k, n in keywords.items() if keyword.startswith(k))
+            for keyword in keywords
+        }
+
+    def first(self, values, missing):
+        """값마다 맞는 키워드 중 가장 작은 규칙 번호 (없거나 문자열이 아니면 missing)"""
+        search, rank = self.pattern.search, self.rank
+        found = np.full(len(values), missing)
+
+        for row, text in enumerate(values):
+            if not isinstance(text, str):
+                continue
+            best, pos = missing, 0
+            while best and (m := search(text, pos)):
+                best = min(best, rank[m.group()])
+                pos = m.start() + 1
+            found[row] = best
+
+        return found
+
+
+class RuleSection:
+    """범위(scope) 하나에 속한 규칙 목록
+
+    scope   : {컬럼: [값, ...]} — 모든 조건에 맞는 행에만 적용 (없으면 전체 행)
+    rules   : [(label, column, keywords, pattern), ...] — 위에 있는 규칙이 우선
+              keywords(글자 그대로) 또는 pattern(정규식) 중 하나
+    default : 범위 안에서 어떤 규칙에도 안 맞을 때 값 (None 이면 그대로 둠)
+
+    키워드 규칙은 컬럼마다 KeywordScanner 하나로 모아 한 번에 찾고,
+    정규식 규칙(예: 상품ID '^C')은 규칙마다 따로 찾는다 (몇 개 안 됨).
+    행마다 맞는 규칙 중 가장 작은 번호를 고르므로 np.select 의 우선순위와 같다.
+    """
+
+    def __init__(self, rules, scope=None, default=None):
+        self.rules = rules
+        self.scope = scope or {}
+        self.default = default
+
+        by_column = {}
+        self.patterns = []
+        for i, (_, column, keywords, pattern) in enumerate(rules):
+            if pattern is not None:
+                self.patterns.append((i, column, re.compile(pattern)))
+                continue
+            column_keywords = by_column.setdefault(column, {})
+            for keyword in keywords:
+                column_keywords.setdefault(keyword, i)
+        self.scanners = {column: KeywordScanner(keywords) for column, keywords in by_column.items()}
+
+    def mask(self, df):
+        mask = np.ones(len(df), dtype=bool)
+        for column, values in self.scope.items():
+            mask &= df[column].isin(values).to_numpy()
+        return mask
+
+    def first_rule(self, df):
+        """행마다 처음 맞는 규칙 번호 (없으면 len(rules))"""
+        missing = len(self.rules)
+        found = np.full(len(df), missing)
+
+        for column, scanner in self.scanners.items():
+            found = np.minimum(found, scanner.first(df[column].tolist(), missing))
+
+        for i, column, pattern in self.patterns:
+            hit = np.array([isinstance(v, str) and pattern.search(v) is not None for v in df[column].tolist()],
+                           dtype=bool)
+            found = np.where(hit, np.minimum(found, i), found)
+
+        return found
+
+
+class Classifier:
+    """데이터로 선언한 키워드 규칙으로 행마다 라벨을 붙임
+
+    규칙 파일(config/rules/*.json) 형식:
+    {
+      "default": "기본값",
+      "sections": [
+        {"scope": {"계정명": [...]}, "default": "...",
+         "rules": [{"label": "...", "keywords": ["...", ...]},
+                   {"label": "...", "column": "상품ID", "pattern": "^C"}]}
+      ]
+    }
+    keywords 는 적요에 들어 있는지(str.contains) 보는 글자 그대로의 키워드,
+    pattern 은 정규식. column 을 안 쓰면 적요.
+    범위가 겹치면 뒤 섹션이 덮어쓴다.
+    """
+
+    def __init__(self, sections, default=""):
+        self.sections = sections
+        self.default = default
+
+    @classmethod
+    def from_dict(cls, config):
+        sections = []
+        for section in config["sections"]:
+            rules = []
+            for rule in section["rules"]:
+                rules.append((
+                    rule["label"],
+                    rule.get("column", TEXT_COLUMN),
+                    rule.get("keywords"),
+                    rule.get("pattern"),
+                ))
+            sections.append(RuleSection(rules, section.get("scope"), section.get("default")))
+        return cls(sections, config.get("default", ""))
+
+    def classify(self, df):
+        labels = np.full(len(df), self.default, dtype=object)
+
+        for section in self.sections:
+            rows = np.flatnonzero(section.mask(df))
+            if not len(rows):
+                continue
+
+            first = section.first_rule(df.iloc[rows])
+            choices = np.array(
+                [label for label, _, _, _ in section.rules] + [section.default],
+                dtype=object
+            )
+            picked = choices[first]
+
+            # 범위 기본값이 없으면 규칙에 안 맞은 행은 그대로 둠
+            if section.default is None:
+                keep = first < len(section.rules)
+                rows, picked = rows[keep], picked[keep]
+
+            labels[rows] = picked
+
+        return labels
+
+
+@lru_cache(maxsize=None)
+def load_rules(name):
+    """config/rules/{name}.json → Classifier (한 번만 읽고 컴파일)"""
+    with open(RULES_DIR / f"{name}.json", encoding="utf-8") as f:
+        return Classifier.from_dict(json.load(f))
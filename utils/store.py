@@ -0,0 +1,201 @@
+import os
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import MutableMapping
+
+import pyarrow.parquet as pq
+
+from utils.cache import CACHE_DIR, SESSION_SUBDIR, _from_table, _to_table
+
+
+STORE_DIR = CACHE_DIR / SESSION_SUBDIR
+SESSION_MAX_BYTES = int(os.environ.get("CAR_ABC_SESSION_MB", "512")) * 1024 * 1024
+SESSION_IDLE_SECONDS = int(os.environ.get("CAR_ABC_SESSION_IDLE_MIN", "120")) * 60
+
+
+class ResultStore(MutableMapping):
+    """세션 하나의 처리 결과 보관소 ({이름: {"df": 결과, "merge_key": 키}})
+
+    st.session_state.processed_results 에 쓰던 dict 와 같은 방식으로 쓴다.
+    메모리에 올린 결과의 합이 max_bytes 를 넘으면 가장 오래 안 쓴 결과부터
+    Parquet 파일로 내리고(spill), 다시 꺼낼 때 파일에서 읽는다.
+    한 번 내린 파일은 결과가 바뀔 때까지 남겨 두므로 다시 내릴 때는 메모리만 비운다.
+
+    이름이 '_' 로 시작하면 처리 결과가 아닌 세션 결과(기타매출 집계, 최종 머지, UE 등).
+    같은 예산으로 내리고 정리하지만 dict 로 돌 때(최종 머지, 내보내기 목록)는 빠진다.
+    """
+
+    def __init__(self, directory, max_bytes=SESSION_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # 이름 → {"df", "merge_key", "token", "bytes", "dtypes", "path"} (뒤쪽이 최근)
+        self._lock = threading.RLock()
+
+    # -----------------------------
+    # dict 인터페이스
+    # -----------------------------
+    def __getitem__(self, name):
+        with self._lock:
+            entry = self._entries[name]
+            if entry["df"] is None:
+                entry["df"] = self._read(entry)
+            self._entries.move_to_end(name)
+
+            df = entry["df"]
+            self._spill()
+            return {"df": df, "merge_key": entry["merge_key"]}
+
+    def __setitem__(self, name, item):
+        # item 에 token(입력 해시 등)이 있고 지난번과 같으면 다시 넣지 않음
+        df = item["df"]
+        token = item.get("token")
+        with self._lock:
+            old = self._entries.get(name)
+            if token is not None and old is not None and old["token"] == token:
+                self._entries.move_to_end(name)
+                self._spill()
+                return
+
+            self._remove_file(self._entries.pop(name, None))
+            self._entries[name] = {
+                "df": df,
+                "merge_key": item.get("merge_key"),
+                "token": token,
+                "bytes": int(df.memory_usage(deep=True).sum()),
+                "dtypes": df.dtypes,
+                "path": None,
+            }
+            self._spill()
+
+    def __delitem__(self, name):
+        with self._lock:
+            self._remove_file(self._entries.pop(name))
+
+    def token(self, name):
+        # 넣을 때 준 token (없으면 None), 파일로 내린 결과도 읽지 않음
+        entry = self._entries.get(name)
+        return entry["token"] if entry else None
+
+    def __contains__(self, name):
+        # 파일로 내린 결과를 읽지 않고 확인
+        return name in self._entries
+
+    def __iter__(self):
+        return iter([name for name in self._entries if not self.reserved(name)])
+
+    def __len__(self):
+        return sum(not self.reserved(name) for name in self._entries)
+
+    @staticmethod
+    def reserved(name):
+        return name.startswith("_")
+
+    # -----------------------------
+    # 메모리 관리
+    # -----------------------------
+    def memory_bytes(self):
+        return sum(e["bytes"] for e in self._entries.values() if e["df"] is not None)
+
+    def spilled(self):
+        return [name for name, e in self._entries.items() if e["df"] is None and not self.reserved(name)]
+
+    def _spill(self):
+        # 가장 최근 결과 하나는 예산을 넘어도 메모리에 둠
+        for name, entry in list(self._entries.items())[:-1]:
+            if self.memory_bytes() <= self.max_bytes:
+                break
+            if entry["df"] is None:
+                continue
+            if entry["path"] is None:
+                entry["path"] = self._write(entry["df"])
+            if entry["path"] is not None:
+                entry["df"] = None
+
+    def _write(self, df):
+        # Arrow 로 못 바꾸는 결과는 메모리에 그대로 둠
+        try:
+            table = _to_table(df)
+        except (TypeError, ValueError):
+            return None
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self.directory / f"{uuid.uuid4().hex}.parquet"
+        pq.write_table(table, path)
+        return path
+
+    @staticmethod
+    def _read(entry):
+        # Parquet 을 거치며 바뀐 dtype(Arrow 문자열 → object 등)은 넣을 때 dtype 으로 되돌림
+        df = _from_table(pq.read_table(entry["path"]))
+        changed = {c: t for c, t in entry["dtypes"].items() if df[c].dtype != t}
+        return df.astype(changed) if changed else df
+
+    @staticmethod
+    def _remove_file(entry):
+        if entry and entry["path"] is not None:
+            entry["path"].unlink(missing_ok=True)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class SessionStores:
+    """브라우저 세션별 ResultStore 모음 (서버 프로세스에 하나)
+
+    세션 id 는 st.session_state 에 둔 uuid.
+    idle_seconds 동안 쓰지 않은 세션(닫힌 탭 등)은 메모리와 파일을 모두 지운다.
+    처음 만들 때는 idle_seconds 넘게 안 쓴 세션 폴더(이전 서버 실행이 남긴 것)만 지운다.
+    (같은 캐시 폴더를 쓰는 다른 서버 프로세스의 세션은 get 때마다 폴더 시각을 갱신하므로 남음)
+    """
+
+    def __init__(self, directory=STORE_DIR, max_bytes=SESSION_MAX_BYTES, idle_seconds=SESSION_IDLE_SECONDS):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.idle_seconds = idle_seconds
+        self._stores = {}
+        self._last_used = {}
+        self._lock = threading.Lock()
+        self._remove_stale()
+
+    def get(self, session_id):
+        with self._lock:
+            now = time.monotonic()
+            if session_id not in self._stores:
+                self._stores[session_id] = ResultStore(self.directory / session_id, self.max_bytes)
+            self._last_used[session_id] = now
+            self._touch(session_id)
+            self._evict_idle(now)
+            return self._stores[session_id]
+
+    def _touch(self, session_id):
+        # 세션 폴더 시각 = 마지막으로 쓴 시각 (다른 프로세스가 시작할 때 지우지 않도록)
+        try:
+            os.utime(self.directory / session_id)
+        except FileNotFoundError:
+            pass
+
+    def _remove_stale(self):
+        if not self.directory.is_dir():
+            return
+        now = time.time()
+        for path in self.directory.iterdir():
+            try:
+                stale = now - path.stat().st_mtime > self.idle_seconds
+            except FileNotFoundError:
+                continue
+            if stale:
+                if path.is_dir():
+                    shutil.rmtree(path, ignore_errors=True)
+                else:
+                    path.unlink(missing_ok=True)
+
+    def _evict_idle(self, now):
+        for session_id, last_used in list(self._last_used.items()):
+            if now - last_used > self.idle_seconds:
+                self._stores.pop(session_id).clear()
+                del self._last_used[session_id]
@@ -0,0 +1,120 @@
+import pandas as pd
+
+
+# 요약 차원 / 금액 (분류는 v5 의 분류, v3 의 구분을 같이 씀)
+SUMMARY_DIMENSIONS = ["회계연도", "회계월", "판매처", "거래처2", "분류", "비고"]
+SUMMARY_MEASURES = ["차변", "대변", "순액", "건수"]
+
+_CATEGORY_SOURCES = ["분류", "구분"]
+
+
+def summarize(name, df, index=None):
+    """결과 하나 → (결과, 요약 차원) 별 차변 / 대변 / 순액(대변-차변) / 건수
+
+    결과에 판매처가 없으면 상품ID 로 기준 데이터의 판매처를 붙인다 (index: VehicleIndex).
+    없는 차원은 빈 문자열로 채워서 한 cube 에 같이 쌓는다.
+    """
+    keys = pd.DataFrame(index=df.index)
+    for dim in SUMMARY_DIMENSIONS:
+        if dim == "분류":
+            source = next((c for c in _CATEGORY_SOURCES if c in df.columns), None)
+            values = df[source] if source else None
+        elif dim == "판매처" and dim not in df.columns and index is not None and "상품ID" in df.columns \
+                and "판매처" in index.products.columns:
+            values = index.product_info(df["상품ID"], ["판매처"])["판매처"]
+        else:
+            values = df[dim] if dim in df.columns else None
+
+        if values is None:
+            keys[dim] = ""
+        elif pd.api.types.is_numeric_dtype(values):
+            keys[dim] = values
+        else:
+            keys[dim] = values.astype(object).where(values.notna(), "")
+
+    for col in ("차변", "대변"):
+        amount = df[col] if col in df.columns else 0
+        keys[col] = pd.to_numeric(amount, errors="coerce")
+
+    grouped = keys.groupby(SUMMARY_DIMENSIONS, dropna=False, sort=False)
+    cube = grouped[["차변", "대변"]].sum()
+    cube["건수"] = grouped.size()
+    cube["순액"] = cube["대변"] - cube["차변"]
+
+    cube = cube.reset_index()
+    cube.insert(0, "결과", name)
+    return cube
+
+
+class SummaryCube:
+    """처리 결과별 요약(summarize)을 쌓아 둔 집계 cube
+
+    결과가 끝날 때 add 로 한 번만 묶고, 요약 탭의 필터 / 피벗은 묶인 cube 에서만 계산한다.
+    token(입력 파일 해시 등)이 지난번과 같으면 다시 묶지 않는다.
+    같은 이름으로 다시 넣으면 그 결과 몫만 바뀐다.
+    """
+
+    def __init__(self):
+        self._parts = {}  # 이름 → (token, 요약)
+        self._cube = None
+
+    def __len__(self):
+        return len(self._parts)
+
+    def add(self, name, df, token=None, index=None):
+        if token is not None and name in self._parts and self._parts[name][0] == token:
+            return False
+        self._parts[name] = (token, summarize(name, df, index))
+        self._cube = None
+        return True
+
+    def remove(self, name):
+        if self._parts.pop(name, None) is not None:
+            self._cube = None
+
+    @property
+    def cube(self):
+        if self._cube is None:
+            parts = [part for _, part in self._parts.values()]
+            self._cube = (
+                pd.concat(parts, ignore_index=True) if parts
+                else pd.DataFrame(columns=["결과"] + SUMMARY_DIMENSIONS + SUMMARY_MEASURES)
+            )
+        return self._cube
+
+    def values(self, dim):
+        return sorted(self.cube[dim].dropna().unique().tolist())
+
+    def query(self, rows, columns=None, value="순액", filters=None):
+        """필터 {차원: [값, ...]} 를 건 뒤 rows x columns 피벗 (합계 행 / 열 포함)"""
+        cube = self.cube
+        for dim, selected in (filters or {}).items():
+            if selected:
+                cube = cube[cube[dim].isin(selected)]
+
+        rows = [rows] if isinstance(rows, str) else list(rows)
+        if columns in rows:
+            columns = None
+        if not rows:
+            return cube[[value]].sum().to_frame("합계").T
+
+        pivot = cube.pivot_table(
+            index=rows,
+            columns=columns or None,
+            values=value,
+            aggfunc="sum",
+            fill_value=0,
+            margins=True,
+            margins_name="합계",
+            observed=True,
+        )
+        # 합계 행 / 열 때문에 연도, 월 라벨이 숫자와 문자열로 섞이므로 문자열로 맞춤
+        pivot.index = _as_text(pivot.index)
+        pivot.columns = _as_text(pivot.columns)
+        return pivot
+
+
+def _as_text(labels):
+    if isinstance(labels, pd.MultiIndex):
+        return labels.set_levels([level.astype(str) for level in labels.levels])
+    return labels.astype(str)
@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+from versions.registry import SPECS
+
+
+# UE 항목: (전처리기, 항목명) — 매출 1개, 나머지는 비용
+UE_REVENUE = ("v1", "상품매출")
+UE_COSTS = [
+    ("v2", "원상회복비"),
+    ("v4", "매도비"),
+    ("v5", "낙찰수수료"),
+    ("v6", "위탁판매수수료"),
+    ("v7", "상품화"),
+    ("v8", "평가사수수료"),
+]
+UE_ITEMS = [UE_REVENUE] + UE_COSTS
+
+
+def _amounts(df):
+    # 상품ID 가 있고 취소가 아닌 행의 (상품ID, 금액) — 금액은 대변 - 차변
+    keep = df["상품ID"].notna()
+    if "비고" in df.columns:
+        keep &= df["비고"].ne("취소")
+    df = df[keep]
+
+    amount = np.zeros(len(df))
+    for col, sign in (("대변", 1), ("차변", -1)):
+        if col in df.columns:
+            amount += sign * pd.to_numeric(df[col], errors="coerce").fillna(0).to_numpy(dtype=float)
+
+    return df["상품ID"].to_numpy(dtype=object), amount
+
+
+def build_ue(results, index=None):
+    """처리 결과들 → 상품ID 당 한 행의 UE 표
+
+    results: {이름: {"df": 결과, ...}} (ResultStore 도 됨, 필요한 결과만 하나씩 꺼냄)
+    결과마다 (상품ID, 금액) 만 뽑아 이어 붙이고, 상품ID 를 한 번 factorize 한 뒤
+    (상품ID 번호, 항목 번호) 칸에 금액을 한 번에 더해 넓은 표를 만든다.
+    (결과별 merge 를 반복하지 않으므로 상품ID 중복이 있어도 행이 늘지 않음)
+    index(VehicleIndex)를 주면 판매연도 / 판매월 / 판매처를 앞에 붙인다.
+    """
+    labels = [label for _, label in UE_ITEMS]
+    ids, items, amounts = [], [], []
+    for item, (key, _) in enumerate(UE_ITEMS):
+        name = SPECS[key].name
+        if name in results:
+            part_ids, part_amounts = _amounts(results[name]["df"])
+            ids.append(part_ids)
+            items.append(np.full(len(part_ids), item))
+            amounts.append(part_amounts)
+
+    if not ids:
+        return pd.DataFrame(columns=["상품ID"] + labels + ["비용합계", "마진", "마진율"])
+
+    codes, uniques = pd.factorize(np.concatenate(ids))
+    cells = np.bincount(
+        codes * len(labels) + np.concatenate(items),
+        weights=np.concatenate(amounts),
+        minlength=len(uniques) * len(labels),
+    )
+    ue = pd.DataFrame(
+        cells.reshape(len(uniques), len(labels)),
+        index=pd.Index(uniques, name="상품ID"),
+        columns=labels,
+    )
+
+    costs = [label for _, label in UE_COSTS]
+    revenue = ue[UE_REVENUE[1]]
+    ue["비용합계"] = ue[costs].sum(axis=1)
+    ue["마진"] = revenue - ue["비용합계"]
+    ue["마진율"] = (ue["마진"] / revenue.where(revenue != 0)).round(4)
+
+    if index is not None:
+        ue = index.product_info(ue.index.to_series()).join(ue)
+        # 기준 데이터에 빈 판매연도 / 판매월이 있으면 float 로 오므로 정수로 (빈값은 <NA>)
+        for col in ("판매연도", "판매월"):
+            if col in ue.columns:
+                ue[col] = ue[col].astype("Int16")
+
+    ue.index.name = "상품ID"
+    return ue.sort_index().reset_index()
@@ -0,0 +1,95 @@
+import difflib
+import json
+import re
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+VENDOR_MAPPING_PATH = Path(__file__).resolve().parent.parent / "config" / "vendor_mapping.json"
+
+# 법인 표기 / 공백 (예: '(주)', '㈜', '주식회사', '(유)')
+_LEGAL_FORMS = re.compile(r'\(\s*주\s*\)|㈜|주식회사|\(\s*유\s*\)|유한회사|\s+')
+
+
+def canonical_name(name):
+    # '롯데렌탈(주)', '주식회사 쏘카' → '롯데렌탈', '쏘카'
+    return _LEGAL_FORMS.sub('', name)
+
+
+class VendorNormalizer:
+    """거래처 이름 → 대표 이름(거래처2)
+
+    1. 매핑 파일에 있는 이름 그대로 찾기
+    2. 법인 표기와 공백을 지운 이름으로 찾기
+    3. 대표 이름으로 시작하는 이름 (예: '현대자동차(주)대구중고차센터' → 현대자동차, 긴 대표 이름 먼저)
+    4. 비슷한 이름 찾기 (difflib, cutoff 이상일 때만)
+    어디에도 안 맞으면 원래 이름을 그대로 돌려준다.
+    결과는 이름별로 기억해 두고, Series 는 고유값만 찾아서 다시 펼친다.
+    """
+
+    def __init__(self, vendors, cutoff=0.85):
+        self.cutoff = cutoff
+
+        # 원장 이름 → 대표 이름 (대표 이름 자신도 포함)
+        self.exact = {}
+        for vendor, aliases in vendors.items():
+            self.exact[vendor] = vendor
+            for alias in aliases:
+                self.exact[alias] = vendor
+
+        self.canonical = {canonical_name(name): vendor for name, vendor in self.exact.items()}
+        self.prefixes = sorted(
+            ((canonical_name(vendor), vendor) for vendor in vendors),
+            key=lambda item: len(item[0]),
+            reverse=True
+        )
+        self.memo = {}
+
+    @classmethod
+    def from_file(cls, path=VENDOR_MAPPING_PATH, cutoff=0.85):
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f)["vendors"], cutoff)
+
+    def lookup(self, name):
+        if name in self.memo:
+            return self.memo[name]
+
+        vendor = self.exact.get(name)
+        if vendor is None and isinstance(name, str):
+            key = canonical_name(name)
+            vendor = self.canonical.get(key)
+
+            if vendor is None:
+                vendor = next((v for prefix, v in self.prefixes if prefix and key.startswith(prefix)), None)
+
+            if vendor is None and len(key) >= 2:
+                close = difflib.get_close_matches(key, self.canonical, n=1, cutoff=self.cutoff)
+                if close:
+                    vendor = self.canonical[close[0]]
+
+        if vendor is None:
+            vendor = name
+
+        self.memo[name] = vendor
+        return vendor
+
+    def normalize(self, s):
+        codes, uniques = pd.factorize(s)
+        if not len(uniques):
+            return s.copy()
+
+        mapped = np.array([self.lookup(v) for v in uniques], dtype=object)
+        return pd.Series(
+            np.where(codes >= 0, mapped[codes], s.to_numpy(dtype=object)),
+            index=s.index,
+            name=s.name
+        )
+
+
+@lru_cache(maxsize=1)
+def load_vendors():
+    """config/vendor_mapping.json → VendorNormalizer (한 번만 읽음)"""
+    return VendorNormalizer.from_file()
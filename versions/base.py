@@ -1,9 +1,140 @@
+import numpy as np
+import pandas as pd
+
+from utils.cancel import find_cancellations
+from utils.dtypes import small_int
+from utils.matching import VehicleIndex
+
+
 class BasePreprocessor:
-    name = ""
-    merge_key = ""
+    """원장 전처리 공통 틀
+
+    process 는 아래 단계를 순서대로 실행한다. 하위 클래스는 필요한 단계만 구현한다.
+    - normalize : 컬럼 컷, 월계/누계 제거, 회계일자 datetime64, 회계연도/회계월 int16 (공통)
+    - extract   : 적요에서 차량번호 추출 (plate_columns)
+    - match     : 차량번호 → 상품ID (index.nearest_days 가 있으면 못 찾은 행은 판매일자가 가까운 차량, 매칭구분='인접월')
+    - suggest   : 상품ID 를 못 찾은 행의 유사 차량번호 후보 (index 에 유사 검색 인덱스가 있을 때만)
+    - classify  : 적요/거래처 분류
+    - flag      : 판매월 일치, 취소 등 표시
+    """
+    # registry 의 ProcessorSpec — 이름 / 머지 키 / 엑셀 구조는 여기서 읽음
+    spec = None
+
+    # 적요에서 뽑을 차량번호 컬럼 (상품ID 매칭도 이 순서로 찾음)
+    plates = None
+    plate_columns = []
+
+    STAGES = ["normalize", "extract", "match", "suggest", "classify", "flag"]
+
+    @property
+    def name(self):
+        return self.spec.name
+
+    @property
+    def merge_key(self):
+        return self.spec.merge_key
+
+    # 엑셀 구조: 필수 컬럼 / 이 컬럼까지만 사용 (읽을 때 usecols 로도 씀)
+    @property
+    def required_columns(self):
+        return list(self.spec.required_columns)
+
+    @property
+    def last_column(self):
+        return self.spec.last_column
 
     def validate(self, df):
-        raise NotImplementedError
+        return set(self.required_columns).issubset(df.columns)
+
+    def preprocess(self, df, base_df=None, index=None, timer=None):
+        df = self.process(df, base_df, index, timer)
+        df = timer.run("finalize", self.finalize, df) if timer else self.finalize(df)
+        return self.check_output(df)
+
+    def check_output(self, df):
+        # spec 에 선언한 결과 컬럼이 다 있는지 (머지 / UE / 요약이 이 컬럼을 씀)
+        missing = [col for col in self.spec.output_columns if col not in df.columns]
+        if missing:
+            raise ValueError(f"{self.name} 결과에 컬럼이 없습니다: {', '.join(missing)}")
+        return df
+
+    def process(self, df, base_df=None, index=None, timer=None):
+        # (회계연도, 회계월) 안에서 끝나는 처리 → 월별로 나눠 실행해도 결과가 같아야 함
+        # timer(StageTimer)를 넘기면 단계별 시간 / 행 수 / 매칭률을 기록
+        if index is None and base_df is not None and self.plate_columns:
+            index = VehicleIndex(base_df)
+
+        for stage in self.STAGES:
+            fn = getattr(self, stage)
+            df = timer.run(stage, fn, df, index) if timer else fn(df, index)
+        return df
+
+    def finalize(self, df):
+        # 전체 기간에 걸친 후처리 (예: 기간 전체 상품ID 중복 여부)
+        return df
+
+    # -----------------------------
+    # 단계
+    # -----------------------------
+    def normalize(self, df, index=None):
+        # 월계/누계 행 제거 + 컬럼 컷을 한 번에 (복사도 한 번)
+        keep = ~df['회계일자'].isin(['월계', '누계']).to_numpy()
+        if self.last_column:
+            df = df.iloc[np.flatnonzero(keep), :df.columns.get_loc(self.last_column) + 1]
+        else:
+            df = df.loc[keep, self.required_columns]
+
+        df['회계일자'] = pd.to_datetime(df['회계일자'])
+        df['회계연도'] = small_int(df['회계일자'].dt.year)
+        df['회계월'] = small_int(df['회계일자'].dt.month)
+        return df
+
+    def extract(self, df, index=None):
+        if self.plate_columns:
+            plates = self.plates.extract(df['적요'], self.plate_columns)
+            for col in self.plate_columns:
+                df[col] = plates[col]
+        return df
+
+    def match(self, df, index=None):
+        if self.plate_columns:
+            df['상품ID'] = index.match(df, self.plate_columns)
+
+            if index.nearest_days:
+                nearest = index.match_nearest(df, self.plate_columns, df['상품ID'].isna())
+                df['매칭구분'] = np.where(
+                    df['상품ID'].notna(), '정확', np.where(nearest.notna(), '인접월', '')
+                )
+                df['상품ID'] = df['상품ID'].where(df['상품ID'].notna(), nearest)
+        return df
+
+    def suggest(self, df, index=None):
+        # 정확 매칭이 끝난 뒤(하위 클래스의 match 포함) 빈 상품ID 행만 찾음
+        if self.plate_columns and index is not None and index.fuzzy is not None:
+            df = df.join(index.fuzzy.suggest(df, self.plate_columns, df['상품ID'].isna()))
+        return df
+
+    def classify(self, df, index=None):
+        return df
+
+    def flag(self, df, index=None):
+        return df
+
+    # -----------------------------
+    # 단계에서 같이 쓰는 처리
+    # -----------------------------
+    def add_sales_info(self, df, index, columns=('판매연도', '판매월')):
+        # 상품ID 의 판매 정보 + 회계월과 판매월이 같은지
+        df = df.join(index.product_info(df['상품ID'], list(columns)))
+        df['판매월일치여부'] = np.where(
+            df['판매월'].isna(),
+            '',
+            np.where(df['회계월'] == df['판매월'], 'TRUE', 'FALSE')
+        )
+        return df
 
-    def preprocess(self, df):
-        raise NotImplementedError
\ No newline at end of file
+    def mark_cancellations(self, df, plate_col):
+        pairs = find_cancellations(df, plate_col)
+        df['비고'] = np.where(pairs['취소'], '취소', '')
+        df['취소상대'] = pairs['취소상대']
+        return df
@@ -0,0 +1,123 @@
+import importlib
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ProcessorSpec:
+    """전처리기 선언 (모듈은 실제로 쓸 때 import)
+
+    keywords       : 파일명에 들어 있으면 이 전처리기로 처리 (없으면 파일명으로 찾지 않음)
+    module / class_name : 구현 위치
+    name / merge_key / required_columns / last_column : 전처리기가 그대로 씀 (클래스에 다시 적지 않음)
+    output_columns : 처리 결과에 새로 생겨야 하는 컬럼 (없으면 preprocess 가 ValueError)
+                     옵션 컬럼 — 유사 후보 utils.fuzzy.SUGGEST_COLUMNS, 인접월 매칭의 매칭구분 — 은 제외
+    """
+    key: str
+    name: str
+    module: str
+    class_name: str
+    keywords: tuple = ()
+    merge_key: str = None
+    required_columns: tuple = ()
+    last_column: str = None
+    output_columns: tuple = ()
+
+
+_CUT = ("회계일자", "적요", "관리항목2")
+_CUT_AMOUNT = ("회계일자", "적요", "대변", "관리항목2")
+
+PROCESSORS = [
+    ProcessorSpec(
+        "v1", "v1(상품매출)", "versions.v1", "PreprocessV1",
+        keywords=("상품매출",), merge_key="상품ID",
+        required_columns=_CUT_AMOUNT, last_column="관리항목2",
+        output_columns=("회계연도", "회계월", "차량번호1", "차량번호2", "상품ID", "판매연도", "판매월",
+                        "판매처", "판매월일치여부", "비고", "취소상대"),
+    ),
+    ProcessorSpec(
+        "v2", "v2(원상회복비)", "versions.v2", "PreprocessV2",
+        keywords=("원상회복비",), merge_key="상품ID",
+        required_columns=_CUT_AMOUNT, last_column="관리항목2",
+        output_columns=("회계연도", "회계월", "차량번호", "상품ID", "판매연도", "판매월",
+                        "판매월일치여부", "비고", "취소상대", "배부"),
+    ),
+    ProcessorSpec(
+        "v3", "v3(기타수수료)", "versions.v3", "PreprocessV3",
+        keywords=("기타수수료",), merge_key=None,  # 머지 안 함 (분류용)
+        required_columns=_CUT, last_column="관리항목2",
+        output_columns=("회계연도", "회계월", "구분", "배부"),
+    ),
+    ProcessorSpec(
+        "v4", "v4(매도비)", "versions.v4", "PreprocessV4",
+        keywords=("매도비",), merge_key="상품ID",
+        required_columns=_CUT_AMOUNT, last_column="관리항목2",
+        output_columns=("회계연도", "회계월", "차량번호1", "차량번호2", "상품ID", "판매연도", "판매월",
+                        "판매월일치여부", "중복", "비고", "취소상대"),
+    ),
+    ProcessorSpec(
+        "v5", "v5(낙찰수수료)", "versions.v5", "PreprocessV5",
+        keywords=("낙찰수수료",), merge_key="상품ID",
+        required_columns=_CUT_AMOUNT, last_column="관리항목2",
+        output_columns=("회계연도", "회계월", "차량번호", "상품ID", "분류", "판매연도", "판매월",
+                        "판매월일치여부", "중복", "비고", "취소상대"),
+    ),
+    ProcessorSpec(
+        "v6", "v6(위탁판매수수료)", "versions.v6", "PreprocessV6",
+        keywords=("위탁판매수수료",), merge_key="상품ID",
+        required_columns=_CUT_AMOUNT, last_column="관리항목2",
+        output_columns=("회계연도", "회계월", "차량번호", "상품ID", "거래처2", "비고"),
+    ),
+    ProcessorSpec(
+        "v7", "v7(상품화)", "versions.v7", "PreprocessV7",
+        keywords=("상품화",), merge_key="상품ID",
+        required_columns=_CUT_AMOUNT, last_column="관리항목2",
+        output_columns=("회계연도", "회계월", "차량번호", "상품ID", "거래처2", "비고"),
+    ),
+    ProcessorSpec(
+        "v8", "v8(평가사수수료)", "versions.v8", "PreprocessV8",
+        keywords=("평가사수수료",), merge_key="상품ID",
+        required_columns=_CUT_AMOUNT, last_column="관리항목2",
+        output_columns=("회계연도", "회계월", "차량번호", "상품ID", "거래처2", "비고"),
+    ),
+    # v9 / v10 은 구현이 생기면 여기에 추가
+    ProcessorSpec(
+        "v11", "v11(기타매출집계)", "versions.v11", "PreprocessV11",
+        merge_key="상품ID",
+        # last_column 없음 → 필수 컬럼만 남김
+        required_columns=("계정코드", "계정명", "회계일자", "NO", "적요", "거래처코드", "거래처",
+                          "차변", "대변", "작성사원명"),
+        output_columns=("회계연도", "회계월", "차량번호", "상품ID", "비고"),
+    ),
+]
+
+SPECS = {spec.key: spec for spec in PROCESSORS}
+
+# 파일명 키워드 → PROCESSORS 안의 순서
+# 모든 위치에서 키워드를 찾도록 lookahead 로 감싸고, 같은 위치면 앞 순서의 키워드를 먼저 시도
+_KEYWORD_ORDER = {kw: order for order, spec in enumerate(PROCESSORS) for kw in spec.keywords}
+_KEYWORD_PATTERN = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(_KEYWORD_ORDER, key=_KEYWORD_ORDER.get))) + "))"
+)
+
+_instances = {}
+
+
+def match_spec(file_name):
+    """파일명에 키워드가 들어 있는 spec 중 PROCESSORS 순서상 첫 번째 (예: '상품화_상품매출' → v1)"""
+    found = [_KEYWORD_ORDER[m.group(1)] for m in _KEYWORD_PATTERN.finditer(file_name)]
+    return PROCESSORS[min(found)] if found else None
+
+
+def get_processor(key):
+    # 처음 쓸 때만 모듈을 import 하고 인스턴스는 재사용
+    if key not in _instances:
+        spec = SPECS[key]
+        cls = getattr(importlib.import_module(spec.module), spec.class_name)
+        _instances[key] = cls()
+    return _instances[key]
+
+
+def find_processor(file_name):
+    spec = match_spec(file_name)
+    return get_processor(spec.key) if spec else None